@@ -0,0 +1,40 @@
+"""
+Benchmark ``Design.first_pass`` with large design matrices.
+
+Run from the repository root::
+
+    python benchmarks/bench_design_matrix.py
+
+Each matrix has two categorical IVs, with 4 and 10 values, and two continuous IVs.
+
+"""
+import sys
+from timeit import default_timer
+
+import numpy as np
+
+from experimentator import Design
+from experimentator.order import Ordering
+
+
+def make_design(n_rows, random_state):
+    matrix = np.column_stack([random_state.randint(4, size=n_rows),
+                              random_state.randint(10, size=n_rows),
+                              random_state.randn(n_rows),
+                              random_state.rand(n_rows)])
+    ivs = [('condition', ['a', 'b', 'c', 'd']), ('stimulus', list(range(10))), ('contrast', None), ('size', None)]
+    return Design(ivs, design_matrix=matrix, ordering=Ordering())
+
+
+def main(repeats=3):
+    random_state = np.random.RandomState(0)
+    for n_rows in [1000, 10000, 100000]:
+        design = make_design(n_rows, random_state)
+        start = default_timer()
+        for _ in range(repeats):
+            design.first_pass()
+        print('{:6} rows: {:8.3f} s'.format(n_rows, (default_timer() - start) / repeats))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,37 @@
+"""
+Benchmark sampling uniform Latin squares by rejection sampling and with the Jacobson-Matthews Markov chain.
+
+Run from the repository root::
+
+    python benchmarks/bench_latin_square.py
+
+Rejection sampling is only timed up to order 5; above that it doesn't finish in a reasonable time.
+
+"""
+import sys
+from timeit import default_timer
+
+from experimentator.order import latin_square
+
+MAX_ORDER_FOR_REJECTION = 5
+
+
+def time_square(order, repeats, **kwargs):
+    start = default_timer()
+    for _ in range(repeats):
+        latin_square(order, **kwargs)
+    return (default_timer() - start) / repeats
+
+
+def main(repeats=10):
+    for order in [3, 4, 5, 10, 20, 30]:
+        markov = time_square(order, repeats, uniform='markov')
+        if order <= MAX_ORDER_FOR_REJECTION:
+            rejection = '{:10.2f} ms'.format(1e3 * time_square(order, repeats, uniform=True))
+        else:
+            rejection = '{:>13}'.format('-')
+        print('order {:2}: rejection {}, markov {:8.2f} ms'.format(order, rejection, 1e3 * markov))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
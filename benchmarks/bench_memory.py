@@ -0,0 +1,41 @@
+"""
+Benchmark the memory used by the sections of a 1,000,000-trial Experiment.
+
+Run from the repository root::
+
+    python benchmarks/bench_memory.py
+
+"""
+import gc
+import sys
+import tracemalloc
+from timeit import default_timer
+
+from experimentator import Experiment
+from experimentator.order import Ordering
+
+
+def make_experiment(n_participants=100, n_blocks=10, n_trials=1000):
+    return Experiment.basic(('participant', 'block', 'trial'),
+                            {'block': {'difficulty': ['easy', 'hard']},
+                             'trial': {'stimulus': range(n_trials // 2), 'side': ['left', 'right']}},
+                            ordering_by_level={'participant': Ordering(n_participants),
+                                               'block': Ordering(n_blocks // 2)})
+
+
+def main(n_participants=100):
+    tracemalloc.start()
+    start = default_timer()
+    exp = make_experiment(n_participants)
+    elapsed = default_timer() - start
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    n_trials = sum(1 for section in exp.walk() if section.is_bottom_level)
+    print('{} trials: {:.1f} MB, {:.0f} bytes per trial, built in {:.1f} s'.format(
+        n_trials, memory / 1e6, memory / n_trials, elapsed))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
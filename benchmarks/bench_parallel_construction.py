@@ -0,0 +1,44 @@
+"""
+Benchmark creating an ``Experiment`` with and without worker processes (``Experiment.new(..., processes=n)``).
+
+Run from the repository root::
+
+    python benchmarks/bench_parallel_construction.py [n_participants] [processes]
+
+The experiment has `n_participants` participants (default 200), each with 20 blocks of 100 trials,
+and is created with `processes` worker processes (default 8).
+Both experiments have the same seed, and are checked to be the same.
+
+"""
+import os
+import sys
+from timeit import default_timer
+
+from experimentator import Experiment
+from experimentator.order import Ordering
+
+
+def make_experiment(n_participants, processes=None):
+    return Experiment.blocked({'a': list(range(4)), 'b': list(range(25))}, n_participants,
+                              orderings={'block': Ordering(20)}, seed=0, processes=processes)
+
+
+def time_construction(n_participants, processes=None):
+    start = default_timer()
+    exp = make_experiment(n_participants, processes)
+    return default_timer() - start, exp
+
+
+def main(n_participants=200, processes=8):
+    print('{} participants, {} sections per participant, {} cores'.format(
+        n_participants, 20 + 20 * 100, os.cpu_count()))
+    serial_time, serial_exp = time_construction(n_participants)
+    print('{:>12}: {:8.3f} s'.format('serial', serial_time))
+    parallel_time, parallel_exp = time_construction(n_participants, processes)
+    print('{:>12}: {:8.3f} s'.format('{} processes'.format(processes), parallel_time))
+    print('{:>12}: {:8.2f}x'.format('speedup', serial_time / parallel_time))
+    assert parallel_exp == serial_exp
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
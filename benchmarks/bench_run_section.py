@@ -0,0 +1,42 @@
+"""
+Benchmark running every trial of a 50,000-trial Experiment with Experiment.run_section.
+
+Run from the repository root::
+
+    python benchmarks/bench_run_section.py
+
+"""
+import sys
+from timeit import default_timer
+
+from experimentator import Experiment
+from experimentator.order import Ordering
+
+
+def trial(experiment, section):
+    return {'result': section.data['stimulus']}
+
+
+def make_experiment(n_participants=10, n_blocks=10, n_trials=500):
+    exp = Experiment.basic(('participant', 'block', 'trial'),
+                           {'trial': {'stimulus': range(n_trials)}},
+                           ordering_by_level={'participant': Ordering(n_participants),
+                                              'block': Ordering(n_blocks)})
+    exp.add_callback('trial', trial)
+    return exp
+
+
+def main(n_participants=10):
+    exp = make_experiment(n_participants)
+    n_trials = sum(1 for section in exp.walk() if section.is_bottom_level)
+
+    start = default_timer()
+    exp.run_section(exp)
+    elapsed = default_timer() - start
+
+    assert exp.has_finished
+    print('{} trials: {:.2f} s, {:.1f} us per trial'.format(n_trials, elapsed, 1e6 * elapsed / n_trials))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
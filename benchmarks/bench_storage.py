@@ -0,0 +1,41 @@
+"""
+Benchmark loading a 100,000-trial Experiment saved in the YAML and binary formats.
+
+Run from the repository root::
+
+    python benchmarks/bench_storage.py
+
+"""
+import os
+import tempfile
+from timeit import default_timer
+
+from experimentator import Experiment
+from experimentator.order import Ordering
+
+
+def make_experiment(n_participants=100, n_trials=1000):
+    return Experiment.basic(('participant', 'trial'),
+                            {'trial': {'stimulus': range(n_trials)}},
+                            ordering_by_level={'participant': Ordering(n_participants)})
+
+
+def time_call(func, *args):
+    start = default_timer()
+    result = func(*args)
+    return default_timer() - start, result
+
+
+def main():
+    exp = make_experiment()
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ('.exp', '.pkl'):
+            filename = os.path.join(directory, 'benchmark' + extension)
+            save_time, _ = time_call(exp.save, filename)
+            load_time, _ = time_call(Experiment.load, filename)
+            print('{:>5}: save {:7.2f} s, load {:7.2f} s, {:6.1f} MB'.format(
+                extension, save_time, load_time, os.path.getsize(filename) / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -335,11 +335,15 @@ rst_epilog = """
 .. |counterbalanced design| replace:: :class:`counterbalanced design <experimentator.order.CompleteCounterbalance>`
 .. |Sorted| replace:: :class:`~experimentator.order.Sorted`
 .. |LatinSquare| replace:: :class:`~experimentator.order.LatinSquare`
+.. |ConditionOrder| replace:: :class:`~experimentator.order.ConditionOrder`
+.. |FullCross| replace:: :class:`~experimentator.design.FullCross`
+.. |DeferredChildren| replace:: :class:`~experimentator.section.DeferredChildren`
 
 .. |Experiment.base_section| replace:: :attr:`Experiment.base_section <experimentator.Experiment.base_section>`
 .. |Experiment.session_data| replace:: :attr:`Experiment.session_data`
 .. |Experiment.dataframe| replace:: :attr:`Experiment.dataframe <experimentator.Experiment.dataframe>`
 .. |Experiment.save| replace:: :meth:`Experiment.save <experimentator.Experiment.save>`
+.. |Experiment.export_data| replace:: :meth:`Experiment.export_data <experimentator.Experiment.export_data>`
 .. |Experiment.filename| replace:: :attr:`Experiment.filename <experimentator.Experiment.filename>`
 .. |Experiment.experiment_data| replace:: :attr:`Experiment.experiment_data <experimentator.Experiment.experiment_data>`
 .. |Experiment.callback_by_level| replace:: :attr:`Experiment.callback_by_level <experimentator.Experiment.callback_by_level>`
@@ -351,20 +355,33 @@ rst_epilog = """
 .. |Experiment.blocked| replace:: :meth:`Experiment.blocked <experimentator.Experiment.blocked>`
 .. |Experiment.basic| replace:: :meth:`Experiment.basic <experimentator.Experiment.basic>`
 .. |Experiment.new| replace:: :meth:`Experiment.new <experimentator.Experiment.new>`
+.. |Experiment.load| replace:: :meth:`Experiment.load <experimentator.Experiment.load>`
+.. |Experiment.checkpoint| replace:: :meth:`Experiment.checkpoint <experimentator.Experiment.checkpoint>`
+.. |Experiment.journal| replace:: :attr:`Experiment.journal <experimentator.Experiment.journal>`
+.. |Experiment.seed| replace:: :attr:`Experiment.seed <experimentator.Experiment.seed>`
+.. |Experiment.journal_filename| replace:: :attr:`Experiment.journal_filename <experimentator.Experiment.journal_filename>`
+.. |Experiment.journal_limit| replace:: :attr:`Experiment.journal_limit <experimentator.Experiment.journal_limit>`
 
 .. |ExperimentSection.add_data| replace:: :meth:`ExperimentSection.add_data <experimentator.section.ExperimentSection.add_data>`
 .. |ExperimentSection.append_child| replace:: :meth:`ExperimentSection.append_child <experimentator.section.ExperimentSection.append_child>`
 .. |ExperimentSection.append_design_tree| replace:: :meth:`ExperimentSection.append_design_tree <experimentator.section.ExperimentSection.append_design_tree>`
 .. |ExperimentSection.subsection| replace:: :meth:`ExperimentSection.subsection <experimentator.section.ExperimentSection.subsection>`
+.. |ExperimentSection.all_subsections| replace:: :meth:`ExperimentSection.all_subsections <experimentator.section.ExperimentSection.all_subsections>`
+.. |ExperimentSection.find_first_not_run| replace:: :meth:`ExperimentSection.find_first_not_run <experimentator.section.ExperimentSection.find_first_not_run>`
+.. |ExperimentSection.find_first_partially_run| replace:: :meth:`ExperimentSection.find_first_partially_run <experimentator.section.ExperimentSection.find_first_partially_run>`
 .. |ExperimentSection.data| replace:: :attr:`ExperimentSection.data <experimentator.section.ExperimentSection.data>`
 .. |ExperimentSection.new| replace:: :meth:`ExperimentSection.new <experimentator.ExperimentSection.new>`
 .. |data| replace:: :attr:`data <experimentator.section.ExperimentSection.data>`
 .. |Design.first_pass| replace:: :meth:`Design.first_pass <experimentator.Design.first_pass>`
 .. |first_pass| replace:: :meth:`~experimentator.Design.first_pass`
+.. |Design.full_cross| replace:: :meth:`Design.full_cross <experimentator.Design.full_cross>`
+.. |Design.get_order| replace:: :meth:`Design.get_order <experimentator.Design.get_order>`
 .. |Design.from_dict| replace:: :meth:`Design.from_dict <experimentator.Design.from_dict>`
 .. |DesignTree.from_spec| replace:: :meth:`DesignTree.from_spec <experimentator.DesignTree.from_spec>`
 .. |DesignTree.new| replace:: :meth:`DesignTree.new <experimentator.DesignTree.new>`
 .. |run_experiment_section| replace:: :func:`~experimentator.Experiment.run_experiment_section`
+.. |Ordering.get_order| replace:: :meth:`Ordering.get_order <experimentator.order.Ordering.get_order>`
+.. |CompleteCounterbalance.get_order| replace:: :meth:`CompleteCounterbalance.get_order <experimentator.order.CompleteCounterbalance.get_order>`
 .. |Ordering.number| replace:: :attr:`Ordering.number <experimentator.order.Ordering.number>`
 .. |latin_square| replace:: :func:`~experimentator.order.latin_square`
 .. |balanced_latin_square| replace:: :func:`~experimentator.order.balanced_latin_square`
@@ -373,6 +390,7 @@ rst_epilog = """
 
 .. |itertools.product| replace:: :func:`itertools.product`
 .. |ChainMap| replace:: :class:`~collections.ChainMap`
+.. |SectionData| replace:: :class:`SectionData <experimentator.section.SectionData>`
 .. |collections.ChainMap| replace:: :class:`collections.ChainMap`
 .. |OrderedDict| replace:: :class:`~collections.OrderedDict`
 .. |context-manager| replace:: :ref:`context-manager <typecontextmanager>`
@@ -392,6 +410,7 @@ rst_epilog = """
 .. |participant| replace:: ``'participant'``
 
 .. _PyYAML:  http://pyyaml.org/wiki/PyYAML
+.. _pyarrow:  https://arrow.apache.org/docs/python/
 .. _pyDOE: http://pythonhosted.org//pyDOE/index.html
 .. _YAML: http://en.wikipedia.org/wiki/YAML
 """
@@ -3,7 +3,9 @@
 Usage:
   exp run [options] <exp-file> (--next=<level>  [--not-finished] | (<level> <n>)... [--from=<n>])
   exp resume [options] <exp-file> (<level> | (<level> <n>)...)
-  exp export <exp-file> <data-file> [ --no-index-label --delim=<sep> --skip=<columns> --float=<format> --nan=<rep>]
+  exp export <exp-file> <data-file> [(<level> <n>)...] [--started | --finished | --incremental] [ --format=<fmt> --no-index-label --delim=<sep> --skip=<columns> --float=<format> --nan=<rep>]
+  exp convert <exp-file> <new-file>
+  exp merge <exp-file> <new-file>
   exp -h | --help
   exp --version
 
@@ -18,6 +20,12 @@ Run/resume options:
                     (specifically, --from=<n> works like the parameter from_section).
 
 Export options (see pandas.DataFrame.to_csv documentation):
+  --started           Only export trials (or whatever the bottom level is) that have started.
+  --finished          Only export trials (or whatever the bottom level is) that have finished.
+  --incremental       Only export finished trials, appending those that finished since the last --incremental export
+                      to <data-file> (csv only). Progress is stored in <data-file>.exported.
+  --format=<fmt>      Data format: csv, parquet, or feather. By default, parquet for files ending in .parquet or .pq,
+                      feather for .feather or .arrow, csv otherwise. The options below only apply to csv.
   --no-index-label    Don't put column labels on index columns (e.g. participant, trial), for easier importing into R.
   --delim=<sep>       Field delimiter [default: ,].
   --skip=<columns>    Comma-separated list of columns to skip.
@@ -41,11 +49,25 @@ Commands:
                                        section must have been started but not finished. E.g.:
                                          exp resume exp1.exp participant 2 session 2
 
-  export <exp-file> <data-file>      Export the data in <exp-file> to csv format as <data-file>.
+  export <exp-file> <data-file>      Export the data in <exp-file> to csv (or parquet or feather) format as <data-file>.
                                      Note: This will not produce readable csv files for experiments with results as
                                            collections (e.g., series, dict). Either write a custom export script, or
                                            skip the problematic column(s) using the --skip <columns> option.
 
+  export <exp-file> <data-file> (<level> <n>)...
+                                     Export only the sections specified by any number of <level> <n> pairs. A level
+                                     can be repeated to export several of its sections, and levels can be skipped to
+                                     select sections in every parent section. E.g., the second session of every
+                                     participant:
+                                       exp export exp1.exp data.csv session 2
+
+  convert <exp-file> <new-file>      Save the experiment in <exp-file> as <new-file>. The format is chosen by the
+                                     extension of <new-file>: binary for .pkl or .pickle, SQLite for .db, .sqlite
+                                     or .sqlite3, a directory for paths ending in /, YAML otherwise.
+
+  merge <exp-file> <new-file>        Merge the per-section files of an experiment saved as a directory (<exp-file>)
+                                     into the single file <new-file>, in the format chosen by its extension.
+
 """
 import sys
 import os
@@ -53,7 +75,7 @@ import logging
 from docopt import docopt
 from schema import Schema, Use, And, Or
 
-from experimentator import __version__, Experiment, run_experiment_section, export_experiment_data
+from experimentator import __version__, Experiment, run_experiment_section, export_experiment_data, _storage, _export
 
 
 def main(args=None):
@@ -64,7 +86,10 @@ def main(args=None):
                      '--delim': str,
                      '--demo': bool,
                      '--help': bool,
+                     '--incremental': bool,
+                     '--finished': bool,
                      '--float': Or(None, str),
+                     '--format': Or(None, And(str, lambda f: f in _export.FORMATS), error='Invalid --format'),
                      '--from': Or(None, Use(lambda x: list(map(int, x.split(','))))),
                      '--nan': Or(None, str),
                      '--next': Or(None, str),
@@ -73,12 +98,16 @@ def main(args=None):
                      '-o': Or(None, str),
                      '--skip': Or(None, Use(lambda x: x.split(','))),
                      '--skip-parents': bool,
+                     '--started': bool,
                      '--version': bool,
                      '<data-file>': Or(None, str),
+                     '<new-file>': Or(None, str),
                      '<exp-file>': Or(lambda x: x is None, os.path.exists, error='Invalid <exp-file>'),
                      '<level>': [str],
                      '<n>': [And(Use(int), lambda n: n > 0)],
+                     'convert': bool,
                      'export': bool,
+                     'merge': bool,
                      'resume': bool,
                      'run': bool,
                      })
@@ -110,9 +139,37 @@ def main(args=None):
         run_experiment_section(exp, **kwargs)
 
     elif options['export']:
+        file_format = options['--format'] or _export.file_format(options['<data-file>'])
+        kwargs = {}
+        if file_format == 'csv':
+            kwargs.update(float_format=options['--float'],
+                          index_label=False if options['--no-index-label'] else None,
+                          na_rep=options['--nan'],
+                          sep=options['--delim'])
+
+        if options['--finished']:
+            kwargs.update(status='finished')
+        elif options['--started']:
+            kwargs.update(status='started')
+        elif options['--incremental']:
+            kwargs.update(incremental=True)
+
+        sections = {}
+        for level, n in zip(options['<level>'], options['<n>']):
+            sections.setdefault(level, []).append(n)
+
         export_experiment_data(options['<exp-file>'], options['<data-file>'],
-                               float_format=options['--float'],
-                               skip_columns=options['--skip'],
-                               index_label=False if options['--no-index-label'] else None,
-                               na_rep=options['--nan'],
-                               sep=options['--delim'])
+                               file_format=file_format, skip_columns=options['--skip'],
+                               sections={level: numbers[0] if len(numbers) == 1 else numbers
+                                         for level, numbers in sections.items()},
+                               **kwargs)
+
+    elif options['convert']:
+        Experiment.load(options['<exp-file>']).save(options['<new-file>'])
+
+    elif options['merge']:
+        if not os.path.isdir(options['<exp-file>']):
+            raise ValueError('{} is not an experiment directory'.format(options['<exp-file>']))
+        if _storage.file_format(options['<new-file>']) == 'directory':
+            raise ValueError('Cannot merge into a directory: {}'.format(options['<new-file>']))
+        Experiment.load(options['<exp-file>']).save(options['<new-file>'])
@@ -0,0 +1,265 @@
+"""
+Writing the data of an |Experiment| to files.
+The format is chosen based on the file extension (see `file_format`), unless given explicitly.
+
+CSV files are written with pandas, a chunk of rows at a time, so that exporting a large experiment
+doesn't require building |ExperimentSection.dataframe|.
+Parquet and Feather (Arrow IPC) files are written with `pyarrow`_, which must be installed separately.
+Their columns are built directly from the data of each section,
+so that each column gets its own type (e.g., integer or boolean) rather than going through a |DataFrame|.
+
+"""
+import numbers
+import os
+
+from experimentator import yaml
+from experimentator._storage import is_deferred
+from experimentator.section import MISSING
+
+FORMATS_BY_EXTENSION = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+FORMATS = ('csv', 'parquet', 'feather')
+# Number of rows of data to write to a .csv file at a time.
+CHUNK_SIZE = 10000
+
+
+def file_format(filename):
+    """
+    Determine the format to export data to, from the extension of `filename`.
+
+    Returns
+    -------
+    {'csv', 'parquet', 'feather'}
+
+    """
+    return FORMATS_BY_EXTENSION.get(os.path.splitext(filename)[1].lower(), 'csv')
+
+
+def export_csv(section, filename, skip_columns=None, section_numbers=None, status=None, incremental=False,
+               chunk_size=CHUNK_SIZE, **kwargs):
+    """
+    Write the data of `section` to a ``.csv`` file, `chunk_size` rows at a time,
+    so that the data is never all in memory at once.
+    The file is the same as writing |ExperimentSection.dataframe| with |DataFrame.to_csv|.
+    See `data_chunks` for `section_numbers` and `status`.
+
+    If `incremental` is True, only the data of bottom-level sections that have finished is written.
+    If the file was exported incrementally before, rows are only appended for the sections that have finished since,
+    and sections that had already finished are not read again.
+    The sections already exported, and the columns of the file, are stored in the file `exported_filename(filename)`.
+
+    """
+    subsections = None
+    state = None
+    if incremental:
+        if status == 'started':
+            raise ValueError('Only finished sections can be exported incrementally')
+        status = 'finished'
+        if os.path.exists(filename) and os.path.exists(exported_filename(filename)):
+            with open(exported_filename(filename)) as f:
+                state = yaml.load(f)
+        exported = {tuple(path) for path in state['exported']} if state else set()
+        subsections, exported_paths = _find_unexported(section, section_numbers, exported)
+
+    if state and state['columns'] is not None:
+        names, levels = state['columns'], state['levels']
+        new_names, _, float_columns = _scan_csv(section, section_numbers, status, subsections)
+        unknown = set(new_names) - set(names) - set(skip_columns or ())
+        if unknown:
+            raise ValueError("Cannot append to {}, which doesn't have the columns {}. Export it again from scratch."
+                             .format(filename, ', '.join(map(repr, sorted(unknown)))))
+        mode = 'a'
+        kwargs['header'] = False
+    else:
+        names, levels, float_columns = _scan_csv(section, section_numbers, status, subsections)
+        names = levels + sorted(set(names) - set(levels) - set(skip_columns or ()))
+        mode = 'w'
+
+    chunks = data_chunks(section, section_numbers, status, chunk_size, subsections=subsections)
+    n_rows = _write_csv(filename, mode, chunks, names, levels, float_columns, **kwargs)
+
+    if incremental:
+        state = {
+            # If nothing has been written, the columns can't be known yet.
+            'columns': names if mode == 'a' or n_rows else None,
+            'levels': levels,
+            'exported': [list(path) for path in exported_paths],
+        }
+        with open(exported_filename(filename), 'w') as f:
+            yaml.dump(state, f)
+
+
+def exported_filename(filename):
+    """The file location where the progress of an incremental export to `filename` is stored."""
+    return filename + '.exported'
+
+
+def _write_csv(filename, mode, chunks, names, levels, float_columns, **kwargs):
+    # Write the data in `chunks` (from `data_chunks`) to a .csv file, and return the number of rows written.
+    from pandas import DataFrame
+    header = kwargs.pop('header', True)
+    total_rows = 0
+    with open(filename, mode) as f:
+        for columns, n_rows in chunks:
+            df = DataFrame({name: columns[name] if name in columns else [float('nan')] * n_rows for name in names},
+                           columns=names)
+            for name in float_columns.intersection(df.columns):
+                # In the whole dataframe, pandas would have made this a float column.
+                if df[name].dtype.kind in 'iu':
+                    df[name] = df[name].astype(float)
+            df.set_index(levels).to_csv(f, header=header, **kwargs)
+            header = False
+            total_rows += n_rows
+    return total_rows
+
+
+def _scan_csv(section, section_numbers, status, subsections=None):
+    # Read the data once before writing, to find the header,
+    # and the columns that pandas would store as floats if all the data were in one dataframe:
+    # columns with a missing value or a float anywhere (integers in these are written as floats).
+    names = {}
+    levels = {}
+    float_columns = set()
+    for columns, _ in data_chunks(section, section_numbers, status, CHUNK_SIZE, missing=MISSING, levels=levels,
+                                  subsections=subsections):
+        names.update(dict.fromkeys(columns))
+        for name, values in columns.items():
+            if name not in float_columns and any(
+                    value is MISSING or (isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral))
+                    for value in values):
+                float_columns.add(name)
+    return list(names), list(levels), float_columns
+
+
+def _find_unexported(section, section_numbers, exported):
+    # Find the finished sections that haven't been exported, given the paths (tuples of section numbers)
+    # of the sections that have been. Returns those sections, in order,
+    # and the paths of all the sections that will have been exported once they are, as few as possible:
+    # the path of a section replaces those of the sections below it once it has finished.
+    # Sections already exported are not descended into, nor are sections that haven't started,
+    # so that sections whose children haven't been created yet (see `DeferredChildren`) stay that way.
+    partially_exported = {path[:i] for path in exported for i in range(len(path))}
+    unexported = []
+    exported_paths = []
+
+    def all_finished(subsection):
+        # A section can finish without all of its trials having run (see the `from_section` argument
+        # of Experiment.run_section), so it only counts as finished if every trial below it has.
+        if not subsection.has_finished:
+            return False
+        if subsection.is_bottom_level:
+            return True
+        return not is_deferred(subsection) and all(all_finished(child) for child in subsection)
+
+    def find(subsection, path):
+        if path in exported:
+            exported_paths.append(path)
+            return
+        if not subsection.has_started or is_deferred(subsection):
+            return
+        finished = all_finished(subsection)
+        if finished and path not in partially_exported:
+            unexported.append(subsection)
+            exported_paths.append(path)
+        elif not subsection.is_bottom_level:
+            n_paths = len(exported_paths)
+            for child in subsection:
+                find(child, path + (child.data[child.level],))
+            if finished:
+                # Everything below has now been exported.
+                del exported_paths[n_paths:]
+                exported_paths.append(path)
+
+    if not section_numbers:
+        find(section, ())
+    else:
+        for subsection in section.all_subsections(**section_numbers):
+            find(subsection, tuple(parent.data[parent.level] for parent in section.parents(subsection)[1:])
+                 + (subsection.data[subsection.level],))
+
+    # Keep the paths that were exported before but weren't visited (e.g. in sections that weren't selected).
+    visited = set(exported_paths)
+    exported_paths.extend(path for path in exported if not any(path[:i] in visited for i in range(len(path) + 1)))
+    return unexported, exported_paths
+
+
+def export_arrow(section, filename, fmt, skip_columns=None, section_numbers=None, status=None, **kwargs):
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('pyarrow is required to export data in the {} format'.format(fmt))
+
+    columns = {}
+    levels = {}
+    n_rows = 0
+    for chunk, n in data_chunks(section, section_numbers, status, chunk_size=None, missing=None, levels=levels):
+        for key, values in chunk.items():
+            columns.setdefault(key, [None] * n_rows).extend(values)
+        n_rows += n
+        for values in columns.values():
+            values.extend(None for _ in range(n_rows - len(values)))
+    levels = list(levels)
+    names = levels + sorted(set(columns) - set(levels) - set(skip_columns or ()))
+
+    arrays = []
+    for name in names:
+        try:
+            arrays.append(pyarrow.array(columns.get(name, [None] * n_rows)))
+        except (ValueError, TypeError) as e:
+            raise ValueError('Cannot export column {!r} in the {} format: {}'.format(name, fmt, e))
+    table = pyarrow.Table.from_arrays(arrays, names=names)
+
+    if fmt == 'parquet':
+        pyarrow.parquet.write_table(table, filename, **kwargs)
+    else:
+        pyarrow.feather.write_feather(table, filename, **kwargs)
+
+
+def data_chunks(section, section_numbers=None, status=None, chunk_size=CHUNK_SIZE, missing=float('nan'), levels=None,
+                subsections=None):
+    """
+    Read the data of the bottom-level sections below `section`, in order, by column.
+
+    Parameters
+    ----------
+    section : |ExperimentSection|
+    section_numbers : dict, optional
+        Only read the data of the sections selected by these section numbers,
+        as in |ExperimentSection.all_subsections|. Other sections are not visited.
+    status : {'started', 'finished'}, optional
+        Only read the data of bottom-level sections that have started, or finished.
+    chunk_size : int, optional
+        Yield the data in chunks of at least this many rows. If None, yield it all at once.
+    missing : optional
+        The value to use where a section has no value for a column.
+    levels : dict, optional
+        The names of the levels of the data (the section numbers that index it) are added to the keys of this dict.
+    subsections : list of |ExperimentSection|, optional
+        Read the data of these sections below `section`, rather than selecting them by `section_numbers`.
+
+    Yields
+    ------
+    columns : dict
+        Maps each column name to a list of values.
+    n_rows : int
+
+    """
+    if levels is None:
+        levels = {}
+    if subsections is None:
+        if not section_numbers:
+            yield from section._data_chunks(chunk_size, missing=missing, levels=levels, status=status)
+            return
+        subsections = section.all_subsections(**section_numbers)
+
+    for subsection in subsections:
+        if subsection is not section:
+            levels.update(dict.fromkeys(parent.level for parent in section.parents(subsection)[1:]))
+            levels[subsection.level] = None
+        yield from subsection._data_chunks(chunk_size, missing=missing, levels=levels, status=status)
@@ -2,6 +2,8 @@ from collections.abc import Iterable
 import yaml
 import numpy as np
 
+from experimentator.section import MISSING, _Missing
+
 
 DTYPE_REPLACEMENTS = {
     'str256': '<U8',
@@ -51,6 +53,16 @@ def complex_constructor(loader, node):
     return complex(node.value)
 
 
+@add_representer(range)
+def range_representer(dumper, data):
+    return dumper.represent_sequence('!range', [data.start, data.stop, data.step], flow_style=True)
+
+
+@add_constructor('!range')
+def range_constructor(loader, node):
+    return range(*loader.construct_sequence(node))
+
+
 @add_representer(np.float64)
 def np_float_representer(dumper, data):
     return dumper.represent_float(float(data))
@@ -70,3 +82,13 @@ def np_dtype_representer(dumper, data):
 def np_dtype_constructor(loader, node):
     name = loader.construct_scalar(node)
     return np.dtype(DTYPE_REPLACEMENTS.get(name, name))
+
+
+@add_representer(_Missing)
+def missing_representer(dumper, data):
+    return dumper.represent_scalar('!missing', '')
+
+
+@add_constructor('!missing')
+def missing_constructor(loader, node):
+    return MISSING
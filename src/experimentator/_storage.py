@@ -0,0 +1,430 @@
+"""
+Reading and writing |Experiment| files.
+The format is chosen based on the file extension (see `file_format`).
+
+In the directory format, the |Experiment| and the top level of sections are stored in ``experiment.pkl``,
+and the descendants of each top-level section are stored in their own file (a *shard*).
+Shards are only read when the children of their section are first accessed.
+Each shard also stores the state of its top-level section, which takes precedence over the index,
+so that a process running one top-level section only needs to write that section's shard.
+
+The SQLite format stores the same shards as rows of a database, which is updated in a single transaction.
+It also keeps a row for every section, keyed by its section numbers and recording its status,
+so that e.g. the first section that hasn't been run can be found without loading any shards
+(see `SqliteIndex`).
+
+Top-level sections whose children haven't been created yet (see `DeferredChildren`) have no shard;
+their stub in the index keeps the `DeferredChildren` until a shard is written for them.
+
+"""
+import io
+import os
+import shutil
+import pickle
+import sqlite3
+from collections import deque
+from contextlib import closing
+
+from experimentator import yaml
+from experimentator.section import DeferredChildren
+
+BINARY_EXTENSIONS = ('.pkl', '.pickle')
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+DIRECTORY_INDEX = 'experiment.pkl'
+
+# Binary files start with this header, followed by the format version and the pickle protocol.
+BINARY_MAGIC = b'experimentator\x00'
+BINARY_VERSION = 1
+PICKLE_PROTOCOL = min(5, pickle.HIGHEST_PROTOCOL)
+
+
+def file_format(filename):
+    """
+    Determine the storage format to use for a file, from its extension.
+
+    Returns
+    -------
+    {'directory', 'sqlite', 'binary', 'yaml'}
+
+    """
+    if os.path.isdir(filename) or filename.endswith(('/', os.sep)):
+        return 'directory'
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        return 'sqlite'
+    if extension in BINARY_EXTENSIONS:
+        return 'binary'
+    return 'yaml'
+
+
+def dump(obj, filename, sections=None):
+    fmt = file_format(filename)
+    if fmt == 'directory':
+        _dump_directory(obj, filename, sections)
+        return
+    if fmt == 'sqlite':
+        _dump_sqlite(obj, filename, sections)
+        return
+
+    # The single-file formats can't refer to shards, so merge them into the tree.
+    load_shards(obj)
+    if fmt == 'binary':
+        with open(filename, 'wb') as f:
+            _write_header(f)
+            pickle.dump(obj, f, protocol=PICKLE_PROTOCOL)
+
+    else:
+        with open(filename, 'w') as f:
+            yaml.dump(obj, f)
+
+
+def load(filename):
+    fmt = file_format(filename)
+    if fmt == 'directory':
+        return _load_directory(filename)
+    if fmt == 'sqlite':
+        return _load_sqlite(filename)
+
+    # Sniff the header rather than trusting the extension, so renamed files still load.
+    with open(filename, 'rb') as f:
+        if _read_header(f, filename):
+            return pickle.load(f)
+
+    with open(filename, 'r') as f:
+        return yaml.load(f)
+
+
+def backup(filename, suffix):
+    """
+    Move `filename` out of the way by appending `suffix`.
+    Directories and databases are copied rather than moved,
+    since unloaded shards are still read from the original location.
+
+    """
+    fmt = file_format(filename)
+    if fmt == 'directory':
+        shutil.copytree(filename, filename.rstrip('/' + os.sep) + suffix)
+    elif fmt == 'sqlite':
+        shutil.copyfile(filename, filename + suffix)
+    else:
+        os.rename(filename, filename + suffix)
+
+
+def load_shards(experiment):
+    """
+    Load the descendants of every top-level section that are still on disk.
+
+    """
+    for child in experiment._children:
+        if not child.is_loaded and not is_deferred(child):
+            child._children  # Loaded on first access.
+
+
+def is_deferred(section):
+    """
+    Whether the children of `section` haven't been created yet.
+
+    """
+    return isinstance(section._source, DeferredChildren)
+
+
+def journal_filename(filename):
+    if file_format(filename) == 'directory':
+        return os.path.join(filename, 'journal')
+    return filename + '.journal'
+
+
+class ShardReference:
+    """
+    Stands in for the children of a top-level section until they are loaded.
+
+    """
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.filename)
+
+    def load_state(self):
+        with open(self.filename, 'rb') as f:
+            _read_header(f, self.filename)
+            return pickle.load(f)
+
+    def load_children(self, section):
+        with open(self.filename, 'rb') as f:
+            _read_header(f, self.filename)
+            pickle.load(f)  # Skip the section's own state.
+            return pickle.load(f)
+
+
+def shard_name(section):
+    return '{}-{}.pkl'.format(section.level, section.data[section.level])
+
+
+def _write_header(f):
+    f.write(BINARY_MAGIC + bytes([BINARY_VERSION, PICKLE_PROTOCOL]))
+
+
+def _read_header(f, filename):
+    if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+        return False
+    version, _ = f.read(2)
+    if version > BINARY_VERSION:
+        raise ValueError('{} was saved by a newer version of experimentator (format version {})'.format(
+            filename, version))
+    return True
+
+
+def _replace(filename, write):
+    # Write to a temporary file first, so other processes never see a partially written file.
+    temp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    with open(temp_filename, 'wb') as f:
+        _write_header(f)
+        write(f)
+    os.replace(temp_filename, filename)
+
+
+def _dump_shard(section, filename):
+    def write(f):
+        pickle.dump(_section_state(section), f, protocol=PICKLE_PROTOCOL)
+        pickle.dump(section._children, f, protocol=PICKLE_PROTOCOL)
+
+    _replace(filename, write)
+
+
+def _section_state(section):
+    return {'data': dict(section.data.maps[0]),
+            'has_started': section.has_started,
+            'has_finished': section.has_finished}
+
+
+def _dump_directory(experiment, directory, sections=None):
+    os.makedirs(directory, exist_ok=True)
+
+    # An experiment that has never been saved has no index yet, so it's saved in full.
+    if sections is not None and os.path.exists(os.path.join(directory, DIRECTORY_INDEX)):
+        # Only write the given shards, leaving the index and the other shards to other processes.
+        for section in sections:
+            _dump_shard(section, os.path.join(directory, shard_name(section)))
+        return
+
+    stubs = deque()
+    for child in experiment._children:
+        if is_deferred(child):
+            stubs.append(_stub(child, child._source))
+            continue
+
+        name = shard_name(child)
+        filename = os.path.join(directory, name)
+        if child.is_loaded or not isinstance(child._source, ShardReference):
+            _dump_shard(child, filename)
+
+        elif not os.path.exists(filename) or not os.path.samefile(child._source.filename, filename):
+            shutil.copyfile(child._source.filename, filename)
+
+        stubs.append(_stub(child, ShardReference(name)))
+
+    _replace(os.path.join(directory, DIRECTORY_INDEX),
+             lambda f: _dump_index(experiment, stubs, f))
+
+
+def _stub(section, source):
+    # A shallow copy of `section`, to be pickled in place of it and its descendants.
+    state = section.__getstate__()
+    state.pop('_children', None)
+    state['_source'] = source
+    stub = section.__class__.__new__(section.__class__)
+    stub.__setstate__(state)
+    return stub
+
+
+def _dump_index(experiment, stubs, f):
+    children = experiment._children
+    experiment._children = stubs
+    try:
+        pickle.dump(experiment, f, protocol=PICKLE_PROTOCOL)
+    finally:
+        experiment._children = children
+
+
+def _load_directory(directory):
+    experiment = load(os.path.join(directory, DIRECTORY_INDEX))
+    for child in experiment._children:
+        filename = os.path.join(directory, shard_name(child))
+        if is_deferred(child) and not os.path.exists(filename):
+            continue
+        child._source = ShardReference(filename)
+
+        # The shard is newer than the index if its section was run by itself.
+        state = child._source.load_state()
+        child.data.maps[0].update(state['data'])
+        child.has_started = state['has_started']
+        child.has_finished = state['has_finished']
+
+    _update_experiment_state(experiment)
+    return experiment
+
+
+def _update_experiment_state(experiment):
+    # The state of the experiment itself isn't saved when only shards are written.
+    if experiment._children:
+        experiment.has_started = experiment.has_started or any(child.has_started for child in experiment._children)
+        experiment.has_finished = all(child.has_finished for child in experiment._children)
+
+
+class SqliteShard:
+    """
+    Stands in for the children of a top-level section stored in an SQLite database until they are loaded.
+
+    """
+    def __init__(self, filename, number):
+        self.filename = filename
+        self.number = number
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.filename, self.number)
+
+    def load_children(self, section):
+        with closing(sqlite3.connect(self.filename)) as connection:
+            children, = connection.execute('SELECT children FROM shards WHERE number = ?', (self.number,)).fetchone()
+        return pickle.loads(children)
+
+
+class SqliteIndex:
+    """
+    Answers queries about the sections stored in an SQLite database, without loading them.
+
+    Every section has a row keyed by its section numbers (e.g. ``'3,1,2'`` for trial 2 of block 1 of participant 3).
+    Rather than the status of the section alone,
+    the indexed columns record whether the section *and all its ancestors* are unstarted, unfinished,
+    or started but unfinished, matching the searches of |ExperimentSection.find_first_not_run|
+    and |ExperimentSection.find_first_partially_run|.
+
+    """
+    statuses = ('not_started', 'not_finished', 'partially_run')
+
+    def __init__(self, filename, levels):
+        self.filename = filename
+        self.levels = levels
+
+    def find_first(self, at_level, status, exclude=()):
+        """
+        Find the section numbers of the first section at `at_level` with `status`,
+        not counting the top-level sections numbered in `exclude`.
+
+        Returns
+        -------
+        dict or None
+            Keyword arguments to |ExperimentSection.subsection|.
+
+        """
+        if status not in self.statuses:
+            raise ValueError('Unknown status: {}'.format(status))
+
+        query = 'SELECT numbers FROM sections WHERE level = ? AND {} AND shard NOT IN ({}) ' \
+                'ORDER BY shard, position LIMIT 1'.format(status, ', '.join('?' * len(exclude)))
+        with closing(sqlite3.connect(self.filename)) as connection:
+            row = connection.execute(query, (at_level,) + tuple(exclude)).fetchone()
+        if row:
+            return dict(zip(self.levels, map(int, row[0].split(','))))
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiment (id INTEGER PRIMARY KEY CHECK (id = 0), state BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS shards (number INTEGER PRIMARY KEY, state BLOB NOT NULL, children BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS sections (
+    numbers TEXT PRIMARY KEY,
+    shard INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    has_started INTEGER NOT NULL,
+    has_finished INTEGER NOT NULL,
+    not_started INTEGER NOT NULL,
+    not_finished INTEGER NOT NULL,
+    partially_run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_by_shard ON sections (shard, position);
+CREATE INDEX IF NOT EXISTS sections_not_started ON sections (level, not_started, shard, position);
+CREATE INDEX IF NOT EXISTS sections_not_finished ON sections (level, not_finished, shard, position);
+CREATE INDEX IF NOT EXISTS sections_partially_run ON sections (level, partially_run, shard, position);
+"""
+
+
+def _section_rows(section):
+    number = section.data[section.level]
+    stack = [(section, (number,), True, True, True)]
+    position = 0
+    while stack:
+        node, numbers, not_started, not_finished, partially_run = stack.pop()
+        not_started = not_started and not node.has_started
+        not_finished = not_finished and not node.has_finished
+        partially_run = partially_run and node.has_started and not node.has_finished
+        yield (','.join(map(str, numbers)), number, position, node.level, node.has_started, node.has_finished,
+               not_started, not_finished, partially_run)
+        position += 1
+
+        for child in reversed(node._children):
+            stack.append((child, numbers + (child.data[child.level],), not_started, not_finished, partially_run))
+
+
+def _dump_sqlite(experiment, filename, sections=None):
+    def is_stored(child):
+        return (not child.is_loaded and isinstance(child._source, SqliteShard)
+                and os.path.exists(filename) and os.path.samefile(child._source.filename, filename))
+
+    with closing(sqlite3.connect(filename)) as connection:
+        # The connection context manager commits the transaction, or rolls it back if there's an error.
+        with connection:
+            connection.executescript(_SQLITE_SCHEMA)
+            if sections is not None and connection.execute('SELECT 1 FROM experiment').fetchone() is None:
+                # The database has never been saved to, so the experiment is saved in full.
+                sections = None
+
+            if sections is None:
+                sections = [child for child in experiment._children if not (is_stored(child) or is_deferred(child))]
+                # The shard's location is filled in when loaded.
+                stubs = deque(_stub(child, child._source if is_deferred(child)
+                                    else SqliteShard(None, child.data[child.level]))
+                              for child in experiment._children)
+                index = io.BytesIO()
+                _dump_index(experiment, stubs, index)
+                connection.execute('INSERT OR REPLACE INTO experiment VALUES (0, ?)', (index.getvalue(),))
+                connection.execute('DELETE FROM shards WHERE number NOT IN ({})'.format(
+                    ', '.join(str(child.data[child.level]) for child in experiment._children)))
+                connection.execute('DELETE FROM sections WHERE shard NOT IN (SELECT number FROM shards)')
+
+            for section in sections:
+                number = section.data[section.level]
+                connection.execute('INSERT OR REPLACE INTO shards VALUES (?, ?, ?)',
+                                   (number, pickle.dumps(_section_state(section), protocol=PICKLE_PROTOCOL),
+                                    pickle.dumps(section._children, protocol=PICKLE_PROTOCOL)))
+                connection.execute('DELETE FROM sections WHERE shard = ?', (number,))
+                connection.executemany('INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                       _section_rows(section))
+
+
+def _load_sqlite(filename):
+    with closing(sqlite3.connect(filename)) as connection:
+        try:
+            row = connection.execute('SELECT state FROM experiment').fetchone()
+        except sqlite3.OperationalError:  # There are no tables.
+            row = None
+        if row is None:
+            raise ValueError('{} does not contain an experiment'.format(filename))
+        index, = row
+        states = dict(connection.execute('SELECT number, state FROM shards'))
+
+    experiment = pickle.loads(index)
+    for child in experiment._children:
+        number = child.data[child.level]
+        if is_deferred(child) and number not in states:
+            continue
+        child._source = SqliteShard(filename, number)
+        state = pickle.loads(states[number])
+        child.data.maps[0].update(state['data'])
+        child.has_started = state['has_started']
+        child.has_finished = state['has_finished']
+
+    _update_experiment_state(experiment)
+    experiment._index = SqliteIndex(filename, [level for level, _ in experiment.tree][1:])
+    return experiment
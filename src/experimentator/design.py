@@ -6,6 +6,7 @@ Public objects are imported in ``__init__.py``.
 from collections.abc import Iterable
 import itertools
 import collections
+import operator
 from copy import copy
 import numpy as np
 from schema import Schema, Or, Optional, And, Use
@@ -142,7 +143,7 @@ class Design:
         ...'ordering': 'Shuffle',
         ...'n': 3}
         >>> Design.from_dict(design_spec)
-        Level(name='block', design=Design(ivs=[('speed', [1, 2, 3]), ('size', [15, 30])], design_matrix=None, ordering=Shuffle(number=3, avoid_repeats=False), extra_data={}))
+        Level(name='block', design=Design(ivs=[('speed', [1, 2, 3]), ('size', [15, 30])], design_matrix=None, ordering=Shuffle(number=3, avoid_repeats=False, max_run=None), extra_data={}))
 
         """
         inputs = Schema({
@@ -185,19 +186,24 @@ class Design:
             return self.__dict__ == other.__dict__
         return False
 
-    def get_order(self, data=None):
+    def get_order(self, data=None, rng=None):
         """Order the conditions.
 
+        Parameters
+        ----------
+        data : dict, optional
+            A dictionary describing the data of the parent section.
+        rng : random.Random, optional
+            The random number generator from which to draw the order (see |Ordering.get_order|).
+
         Returns
         -------
-        list of dict
-            A list of dictionaries, each specifying a condition (a mapping from IV names to values).
+        |ConditionOrder|
+            A sequence of dictionaries, each specifying a condition (a mapping from IV names to values).
+            Each dictionary is constructed when it is accessed.
 
         """
-        condition_order = self.ordering.get_order(data)
-        for condition in condition_order:
-            condition.update(self.extra_data)
-        return condition_order
+        return order.ConditionOrder(self.ordering.get_order(data, rng), extra_data=self.extra_data)
 
     def first_pass(self):
         """Initialize design.
@@ -250,8 +256,10 @@ class Design:
     def full_cross(iv_names, iv_values):
         """
         Perform a full factorial cross of the independent variables.
-        Yields dictionaries, each describing one condition, a mapping from IV names to IV values.
-        One dictionary is yielded for every possible combination of IV values.
+        Returns a |FullCross|, a sequence of dictionaries,
+        each describing one condition, a mapping from IV names to IV values.
+        It has one dictionary for every possible combination of IV values,
+        but each is only constructed when it is accessed.
 
         Parameters
         ----------
@@ -262,26 +270,35 @@ class Design:
             Must be the same length as `iv_names`.
             Its elements must be hashable.
 
-        """
-        iv_combinations = itertools.product(*iv_values)
+        Returns
+        -------
+        |FullCross|
 
-        yield from (dict(zip(iv_names, iv_combination)) for iv_combination in iv_combinations)
+        """
+        return FullCross(iv_names, iv_values)
 
     def _parse_design_matrix(self, design_matrix):
-        values_per_factor = [np.unique(column) for column in np.transpose(design_matrix)]
-        if any(iv_values and not len(iv_values) == len(values)
-               for iv_values, values in zip(self.iv_values, values_per_factor)):
-            raise ValueError('Unique elements in design matrix do not match number of values in IV definition')
+        if isinstance(design_matrix, np.ndarray):
+            columns = list(design_matrix.T)
+        else:
+            columns = list(zip(*design_matrix))
+
+        values_per_column = []
+        for iv_values, column in zip(self.iv_values, columns):
+            if not iv_values:
+                values_per_column.append(column)
+                continue
+
+            # Each unique element is replaced by the IV value in the same (sorted) position.
+            unique_elements, indices = np.unique(column, return_inverse=True)
+            if not len(iv_values) == len(unique_elements):
+                raise ValueError('Unique elements in design matrix do not match number of values in IV definition')
+            values_per_column.append(np.array(iv_values)[indices.ravel()])
 
         conditions = []
-        for row in design_matrix:
+        for values in zip(*values_per_column):
             condition = self.extra_data.copy()
-            for iv_name, iv_values, factor_values, design_matrix_value in zip(
-                    self.iv_names, self.iv_values, values_per_factor, row):
-                if iv_values:
-                    condition.update({iv_name: np.array(iv_values)[factor_values == design_matrix_value][0]})
-                else:
-                    condition.update({iv_name: design_matrix_value})
+            condition.update(zip(self.iv_names, values))
             conditions.append(condition)
 
         return conditions
@@ -295,6 +312,80 @@ class Design:
         return dict(zip(self.iv_names, self.iv_values)).get(self.heterogeneous_design_iv_name, ())
 
 
+class FullCross(collections.abc.Sequence):
+    """
+    The conditions of a full factorial cross of independent variables,
+    in the order of |itertools.product|.
+    Conditions are constructed from their index when they are accessed,
+    so that only the IV values are kept in memory, however many combinations there are.
+    Multiplying a |FullCross| by an integer repeats its conditions, like multiplying a list.
+
+    Parameters
+    ----------
+    iv_names : list of str
+        Names of IVs.
+    iv_values : list of list
+        Each element defines the possible values of an IV.
+    number : int, optional
+        The number of times the conditions are repeated (default=1).
+
+    """
+    def __init__(self, iv_names, iv_values, number=1):
+        self.iv_names = list(iv_names)
+        self.iv_values = [values if isinstance(values, collections.abc.Sequence) else list(values)
+                          for values in iv_values]
+        self.number = number
+
+    def __repr__(self):
+        return 'FullCross(iv_names={}, iv_values={}, number={})'.format(self.iv_names, self.iv_values, self.number)
+
+    def __eq__(self, other):
+        if isinstance(other, type(self)):
+            return self.__dict__ == other.__dict__
+        if isinstance(other, collections.abc.Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(first == second for first, second in zip(self, other))
+        return NotImplemented
+
+    def __mul__(self, number):
+        return FullCross(self.iv_names, self.iv_values, self.number * number)
+
+    __rmul__ = __mul__
+
+    @property
+    def n_unique(self):
+        """The number of unique conditions, the product of the numbers of values of each IV."""
+        n_unique = 1
+        for values in self.iv_values:
+            n_unique *= len(values)
+        return n_unique
+
+    def __len__(self):
+        return self.number * self.n_unique
+
+    def __iter__(self):
+        for _ in range(self.number):
+            for iv_combination in itertools.product(*self.iv_values):
+                yield dict(zip(self.iv_names, iv_combination))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('FullCross index out of range')
+
+        # The index in mixed radix, with the last IV changing fastest.
+        index %= self.n_unique
+        iv_combination = []
+        for values in reversed(self.iv_values):
+            index, value_index = divmod(index, len(values))
+            iv_combination.append(values[value_index])
+        return dict(zip(self.iv_names, reversed(iv_combination)))
+
+
 class DesignTree:
     """
     A container for |Design| instances, describing the entire hierarchy of a basic |Experiment|.
@@ -4,16 +4,17 @@ Public objects are imported in ``__init__.py``.
 
 """
 import os
-import pickle
 import inspect
+import itertools
 from logging import getLogger
 from importlib import import_module
 from contextlib import contextmanager, ExitStack
 from datetime import datetime
 from collections import namedtuple
+import numpy as np
 
-from experimentator import yaml
-from experimentator.section import ExperimentSection
+from experimentator import yaml, _storage, _export
+from experimentator.section import ExperimentSection, _seeded_rng
 from experimentator.design import DesignTree, Design
 import experimentator.order as order
 
@@ -27,6 +28,11 @@ def run_experiment_section(experiment, section_obj=None, demo=False, resume=Fals
     Run an experiment from a file or an |Experiment| instance, and save it.
     If an exception is encountered, the |Experiment| will be backed up and saved.
 
+    If the |Experiment| is saved in the directory or SQLite format (see |Experiment.save|),
+    only the top-level section containing the section being run is saved.
+    This way, multiple processes (e.g., on different computers sharing the directory)
+    can run different top-level sections of the same |Experiment| at the same time.
+
     Parameters
     ----------
     experiment : str or |Experiment|
@@ -90,17 +96,23 @@ def run_experiment_section(experiment, section_obj=None, demo=False, resume=Fals
     except:
         logger.warning('Exception occurred, saving backup.')
         # Backup experiment file.
-        os.rename(exp.filename,
-                  exp.filename + datetime.now().strftime('.%m-%d-%H-%M-backup'))
+        _storage.backup(exp.filename, datetime.now().strftime('.%m-%d-%H-%M-backup'))
         raise
 
     finally:
-        exp.save()
+        if exp.journal:
+            exp.checkpoint()
+        elif (exp.filename and _storage.file_format(exp.filename) in ('directory', 'sqlite')
+              and not section_obj.is_top_level):
+            # Only write the shard being run, so other processes can run other shards at the same time.
+            exp.save(sections=exp.parents(section_obj)[1:2] or [section_obj])
+        else:
+            exp.save()
 
 
 def export_experiment_data(exp_filename, data_filename, **kwargs):
     """
-    Reads a pickled |Experiment| instance and saves its data in ``.csv`` format.
+    Reads a pickled |Experiment| instance and saves its data in ``.csv``, Parquet, or Feather format.
 
     Parameters
      ----------
@@ -110,8 +122,19 @@ def export_experiment_data(exp_filename, data_filename, **kwargs):
         The file location where the data will be written.
     skip_columns : list of str, optional
         Data columns to skip.
+    file_format : {'csv', 'parquet', 'feather'}, optional
+        The format to write. By default, it is chosen by the extension of `data_filename`
+        (see |Experiment.export_data|).
+    sections : dict, optional
+        Section numbers selecting which sections' data to export (see |Experiment.export_data|).
+    status : {'started', 'finished'}, optional
+        Only export the data of bottom-level sections that have started or finished.
+    incremental : bool, optional
+        Only append the data of sections that have finished since the last incremental export
+        (see |Experiment.export_data|).
     **kwargs
-        Arbitrary keyword arguments passed through to |DataFrame.to_csv|.
+        Arbitrary keyword arguments passed through to |DataFrame.to_csv|
+        (or for the other formats, to the `pyarrow`_ function that writes the file).
 
     Notes
     -----
@@ -167,8 +190,35 @@ class Experiment(ExperimentSection):
     experiment_data : dict
         A dictionary where data can be stored that is persistent across Python sessions.
         Everything stored here must be |picklable|.
+    journal : bool
+        If True (default is False), changes to sections
+        (sections starting and finishing, and data being added to them, whether or not they are running)
+        are appended as small records to a sidecar file, |Experiment.journal_filename|,
+        rather than requiring the entire |Experiment| to be saved.
+        Changes to |Experiment.experiment_data| and to the callbacks are recorded by |Experiment.checkpoint|.
+        The records are replayed by |Experiment.load|,
+        and folded back into the main file by |Experiment.checkpoint| or |Experiment.save|.
+    journal_limit : int
+        When journaling, the number of records after which |Experiment.checkpoint| compacts the journal
+        (default is 1000).
+    seed : int
+        The seed from which the random number generator of each section is derived,
+        with which the section's children are ordered.
+        Each section's generator depends only on this seed and the section's position in the experiment,
+        so any part of the experiment can be created again (or elsewhere) exactly as it was
+        (see |ExperimentSection.new|).
+        None for experiments saved by older versions.
 
     """
+    journal = False
+    journal_limit = 1000
+    seed = None
+    _journal_length = 0
+    # The last journal record of the Experiment's own state, to tell whether it has changed since.
+    _journaled_state = None
+    # Looks up sections that haven't been loaded, for experiments loaded from a database.
+    _index = None
+
     def __init__(self, tree,
                  data=None,
                  has_started=False,
@@ -180,6 +230,9 @@ class Experiment(ExperimentSection):
                  session_data=None,
                  experiment_data=None,
                  _callback_info=None,
+                 journal=False,
+                 journal_limit=1000,
+                 seed=None,
                  ):
         super().__init__(tree, data=data, has_started=has_started, has_finished=has_finished, _children=_children)
         self.filename = filename
@@ -188,9 +241,14 @@ class Experiment(ExperimentSection):
         self.session_data = {} if session_data is None else session_data
         self.experiment_data = {} if experiment_data is None else experiment_data
         self._callback_info = {} if _callback_info is None else _callback_info
+        self.journal = journal
+        self.journal_limit = journal_limit
+        self.seed = seed
+        self._journal_length = 0
+        self._cursors = {}
 
     @classmethod
-    def new(cls, tree, filename=None):
+    def new(cls, tree, filename=None, lazy=False, seed=None, processes=None):
         """Make a new |Experiment|.
 
         Parameters
@@ -199,11 +257,29 @@ class Experiment(ExperimentSection):
             A |DesignTree| instance defining the experiment hierarchy.
         filename : str, optional
             A file location where the |Experiment| will be saved.
+        lazy : bool, optional
+            If True (default is False), sections are only created when they are first accessed,
+            so that creating a large experiment is nearly instant,
+            and only the sections that are run (or otherwise accessed) take up memory.
+            See |ExperimentSection.new|.
+        seed : int, optional
+            Seeds the random ordering of sections, saved as |Experiment.seed|.
+            If not given, a seed is chosen at random.
+        processes : int, optional
+            If given, the top-level sections (e.g., participants) are created in this process,
+            and the sections below each of them in one of `processes` worker processes,
+            which is faster for large experiments on a computer with several cores.
+            The experiment is the same either way.
+            Ignored if `lazy` is True.
 
         """
         tree.add_base_level()
-        self = super(Experiment, cls).new(tree)
+        self = super(Experiment, cls).new(tree, lazy=True)
         self.filename = filename
+        self.seed = np.random.SeedSequence(seed).entropy
+        _draw_latin_squares(tree, _seeded_rng(self.seed))
+        if not lazy:
+            self._create_descendants(processes=processes)
         return self
 
     @staticmethod
@@ -215,15 +291,20 @@ class Experiment(ExperimentSection):
         ----------
         filename : str
             Path to a file generated by |Experiment.save|.
+            Both the YAML and the binary format are recognized, regardless of the file extension.
+            If `filename` is a directory, the |Experiment| is loaded lazily;
+            see |Experiment.save|.
 
         Returns
         -------
         |Experiment|
 
         """
-        with open(filename, 'r') as f:
-            self = yaml.load(f)
+        self = _storage.load(filename)
         self.filename = filename
+        self._replay_journal()
+        if self.journal:
+            self._journaled_state = self._state_record()
         return self
 
     @classmethod
@@ -238,6 +319,8 @@ class Experiment(ExperimentSection):
             The value of this key specifies the |DesignTree|.
             See |DesignTree.from_spec| for details.
             The value of the key ``'filename'`` or ``'file'``, if one exists,is saved in |Experiment.filename|.
+            The values of the keys ``'lazy'``, ``'seed'`` and ``'processes'``, if they exist,
+            are passed to |Experiment.new|.
             All other fields are saved in |Experiment.experiment_data|.
 
         Returns
@@ -251,7 +334,8 @@ class Experiment(ExperimentSection):
         """
         tree = DesignTree.from_spec(spec.pop('design'))
         filename = spec.pop('filename', spec.pop('file', None))
-        self = cls.new(tree, filename=filename)
+        self = cls.new(tree, filename=filename, lazy=spec.pop('lazy', False), seed=spec.pop('seed', None),
+                       processes=spec.pop('processes', None))
         self.experiment_data = spec
         return self
 
@@ -279,7 +363,8 @@ class Experiment(ExperimentSection):
         return cls.from_dict(spec)
 
     @classmethod
-    def within_subjects(cls, ivs, n_participants, design_matrix=None, ordering=None, filename=None):
+    def within_subjects(cls, ivs, n_participants, design_matrix=None, ordering=None, filename=None, lazy=False,
+                        seed=None, processes=None):
         """
         Create a within-subjects |Experiment|, with all the IVs at the |trial| level.
 
@@ -300,6 +385,13 @@ class Experiment(ExperimentSection):
             If not specified, |Shuffle| will be used.
         filename : str, optional
             File location to save the experiment.
+        lazy : bool, optional
+            If True (default is False), sections are only created when they are first accessed.
+            See |Experiment.new|.
+        seed : int, optional
+            Seeds the random ordering of sections. See |Experiment.new|.
+        processes : int, optional
+            The number of processes with which to create sections. See |Experiment.new|.
 
         Returns
         -------
@@ -309,10 +401,12 @@ class Experiment(ExperimentSection):
         levels_and_designs = [('participant', [Design(ordering=order.Shuffle(n_participants))]),
                               ('trial', [Design(ivs=ivs, design_matrix=design_matrix, ordering=ordering)])]
 
-        return cls.new(DesignTree.new(levels_and_designs), filename=filename)
+        return cls.new(DesignTree.new(levels_and_designs), filename=filename, lazy=lazy, seed=seed,
+                       processes=processes)
 
     @classmethod
-    def blocked(cls, trial_ivs, n_participants, design_matrices=None, orderings=None, block_ivs=None, filename=None):
+    def blocked(cls, trial_ivs, n_participants, design_matrices=None, orderings=None, block_ivs=None, filename=None,
+                lazy=False, seed=None, processes=None):
         """Create a blocked within-subjects |Experiment|,
         in which all the IVs are at either the trial level or the block level.
 
@@ -342,6 +436,13 @@ class Experiment(ExperimentSection):
             See |IV docs| for more on specifying IVs.
         filename : str, optional
             File location to save the experiment.
+        lazy : bool, optional
+            If True (default is False), sections are only created when they are first accessed.
+            See |Experiment.new|.
+        seed : int, optional
+            Seeds the random ordering of sections. See |Experiment.new|.
+        processes : int, optional
+            The number of processes with which to create sections. See |Experiment.new|.
 
         Notes
         -----
@@ -367,10 +468,12 @@ class Experiment(ExperimentSection):
                                                 design_matrix=design_matrices.get('trial'),
                                                 ordering=orderings.get('trial'))])]
 
-        return cls.new(DesignTree.new(levels_and_designs), filename=filename)
+        return cls.new(DesignTree.new(levels_and_designs), filename=filename, lazy=lazy, seed=seed,
+                       processes=processes)
 
     @classmethod
-    def basic(cls, levels, ivs_by_level, design_matrices_by_level=None, ordering_by_level=None, filename=None):
+    def basic(cls, levels, ivs_by_level, design_matrices_by_level=None, ordering_by_level=None, filename=None,
+              lazy=False, seed=None, processes=None):
         """Construct a homogeneously-organized |Experiment|,
         with arbitrary levels but only one |Design| at each level,
         and the same structure throughout its hierarchy.
@@ -398,6 +501,13 @@ class Experiment(ExperimentSection):
             For any levels without an order specified, |Shuffle| will be used.
         filename : str, optional
             File location to save the experiment.
+        lazy : bool, optional
+            If True (default is False), sections are only created when they are first accessed.
+            See |Experiment.new|.
+        seed : int, optional
+            Seeds the random ordering of sections. See |Experiment.new|.
+        processes : int, optional
+            The number of processes with which to create sections. See |Experiment.new|.
 
         Returns
         -------
@@ -414,29 +524,154 @@ class Experiment(ExperimentSection):
                                        ordering=ordering_by_level.get(level))])
                               for level in levels]
 
-        return cls.new(DesignTree.new(levels_and_designs), filename=filename)
+        return cls.new(DesignTree.new(levels_and_designs), filename=filename, lazy=lazy, seed=seed,
+                       processes=processes)
 
-    def save(self, filename=None):
+    def save(self, filename=None, sections=None):
         """Save the |Experiment| to disk.
 
+        The format is determined by the file extension.
+        Files ending in ``.pkl`` or ``.pickle`` are saved in a compact binary format
+        (a versioned header followed by a pickle), which is much faster to load for large experiments.
+        Any other file is saved as YAML.
+
+        If `filename` is a directory (or ends with a path separator),
+        the |Experiment| is saved in the directory format:
+        each section at the top level of the hierarchy (e.g., each participant) gets its own file,
+        and these files are only read by |Experiment.load| when the section's contents are first accessed.
+        Only the files of sections that have been accessed are rewritten.
+
+        Files ending in ``.db``, ``.sqlite`` or ``.sqlite3`` are saved as an SQLite database.
+        Like the directory format, sections are loaded as they are accessed,
+        and in addition the database keeps an index of the status of every section,
+        so |ExperimentSection.find_first_not_run| and |ExperimentSection.find_first_partially_run|
+        don't need to load sections to search them.
+        Changes are saved in a single transaction, so a crash while saving can't corrupt the file.
+
         Parameters
         ----------
         filename : str, optional
             If specified, overrides |Experiment.filename|.
+        sections : list of |ExperimentSection|, optional
+            Top-level sections to save, in the directory or SQLite format.
+            If specified, only these sections are written, leaving the rest of the file untouched.
 
         """
         filename = filename or self.filename
         if filename:
             logger.debug('Saving Experiment instance to {}.'.format(filename))
-            with open(filename, 'w') as f:
-                yaml.dump(self, f)
+            compacting = filename == self.filename and sections is None
+            if compacting:
+                self._journal_length = 0
+                self._journaled_state = self._state_record() if self.journal else None
+            _storage.dump(self, filename, sections=sections)
+
+            # The new file includes everything in the journal.
+            if compacting and os.path.exists(self.journal_filename):
+                os.remove(self.journal_filename)
 
         else:
             logger.warning('Cannot save experiment: No filename provided.')
 
-    def export_data(self, filename, skip_columns=None, **kwargs):
+    @property
+    def journal_filename(self):
+        """
+        The file location of the journal, the sidecar file where changes are recorded
+        when |Experiment.journal| is True.
+
+        """
+        if self.filename:
+            return _storage.journal_filename(self.filename)
+
+    def checkpoint(self):
+        """
+        Make sure the progress of the |Experiment| is stored on disk.
+        When |Experiment.journal| is True, changes are already on disk in the journal,
+        so the |Experiment| is only saved (compacting the journal)
+        if the journal has grown past |Experiment.journal_limit| records
+        or there is no saved file yet.
+        Otherwise, changes to |Experiment.experiment_data| and to the callbacks are appended to the journal.
+        Without journaling, this is equivalent to |Experiment.save|.
+
         """
-        Export |Experiment.dataframe| in ``.csv`` format.
+        if (not self.journal or self._journal_length >= self.journal_limit
+                or not (self.filename and os.path.exists(self.filename))):
+            self.save()
+        else:
+            self._record_state()
+
+    def _data_added(self, section):
+        self._record(section)
+
+    def _state_record(self):
+        # The state of the Experiment that isn't part of any section, as a journal record.
+        record = {
+            'experiment_data': self.experiment_data,
+            'callback_info': self._callback_info,
+            'callback_types': self.callback_type_by_level,
+        }
+        return yaml.dump(record, explicit_start=True)
+
+    def _record_state(self):
+        record = self._state_record()
+        if record == self._journaled_state:
+            return
+        with open(self.journal_filename, 'a') as f:
+            f.write(record)
+        self._journal_length += 1
+        self._journaled_state = record
+
+    def _record(self, section, parents=None):
+        if not (self.journal and self.filename):
+            return
+
+        if parents is None:
+            parents = self.parents(section)
+        record = {
+            'section': {parent.level: parent.data[parent.level] for parent in parents + [section]
+                        if not parent.is_top_level},
+            'data': dict(section.data.maps[0]),
+            'has_started': section.has_started,
+            'has_finished': section.has_finished,
+        }
+        with open(self.journal_filename, 'a') as f:
+            yaml.dump(record, f, explicit_start=True)
+        self._journal_length += 1
+
+    def _replay_journal(self):
+        if not (self.filename and os.path.exists(self.journal_filename)):
+            return
+
+        logger.debug('Replaying journal {}.'.format(self.journal_filename))
+        with open(self.journal_filename, 'r') as f:
+            for record in yaml.load_all(f):
+                self._journal_length += 1
+                if 'section' not in record:
+                    self.experiment_data = record['experiment_data']
+                    self._callback_info = record['callback_info']
+                    self.callback_type_by_level = record['callback_types']
+                    self.callback_by_level = {level: _callback_partial(*self._callback_info[level])
+                                              for level in self._callback_info}
+                    continue
+                section = self.subsection(**record['section'])
+                # Not `add_data`, which would record the data again.
+                section.data.update(record['data'])
+                section.has_started = record['has_started']
+                section.has_finished = record['has_finished']
+
+    def export_data(self, filename, skip_columns=None, file_format=None, sections=None, status=None, incremental=False,
+                    **kwargs):
+        """
+        Export |Experiment.dataframe| in ``.csv``, Parquet, or Feather (Arrow IPC) format.
+
+        The Parquet and Feather formats require `pyarrow`_.
+        They are faster to write and read than ``.csv`` and store the type of each column,
+        so that e.g. IVs with integer or boolean values are read back as such.
+        Each column must hold values of a single type.
+        The section numbers, which form the index of |Experiment.dataframe|, are written as the first columns.
+
+        ``.csv`` files are written a chunk of rows at a time, rather than by building |Experiment.dataframe|,
+        so that the whole dataset is never in memory at once.
 
         Parameters
         ----------
@@ -444,8 +679,23 @@ class Experiment(ExperimentSection):
             A file location where the data should be saved.
         skip_columns : list of str, optional
             Columns to skip.
+        file_format : {'csv', 'parquet', 'feather'}, optional
+            The format to write. By default, files ending in ``.parquet`` or ``.pq`` are written in the Parquet format,
+            files ending in ``.feather`` or ``.arrow`` in the Feather format, and anything else as ``.csv``.
+        sections : dict, optional
+            Section numbers selecting which sections' data to export, in the same form as the keyword arguments
+            of |ExperimentSection.all_subsections|, e.g. ``{'participant': 1}`` or ``{'session': [1, 2]}``.
+            Only the selected sections are read. By default, the data of the entire experiment is exported.
+        status : {'started', 'finished'}, optional
+            If given, only export the data of trials (or whatever the bottom level is) that have started or finished.
+        incremental : bool, optional
+            If True, only export trials that have finished, and if `filename` was exported incrementally before,
+            append only the trials that have finished since, rather than writing the whole file again.
+            Which sections have been exported is stored in a sidecar file, `filename` plus ``.exported``.
+            Only the ``.csv`` format can be exported incrementally.
         **kwargs
-            Arbitrary keyword arguments to pass to |DataFrame.to_csv|.
+            Arbitrary keyword arguments to pass to |DataFrame.to_csv|,
+            or to :func:`pyarrow.parquet.write_table` or :func:`pyarrow.feather.write_feather`.
 
         Notes
         -----
@@ -456,12 +706,21 @@ class Experiment(ExperimentSection):
         or use the `skip_columns` option to skip any compound columns.
 
         """
-        df = self.dataframe
-        if skip_columns:
-            kwargs['columns'] = set(df.columns) - set(skip_columns)
-
-        with open(filename, 'w') as f:
-            df.to_csv(f, **kwargs)
+        if file_format is None:
+            file_format = _export.file_format(filename)
+        if file_format not in _export.FORMATS:
+            raise ValueError('Unknown data format: {}'.format(file_format))
+        if status not in (None, 'started', 'finished'):
+            raise ValueError('Unknown section status: {}'.format(status))
+        if incremental and file_format != 'csv':
+            raise ValueError('Only csv data can be exported incrementally')
+
+        if file_format == 'csv':
+            _export.export_csv(self, filename, skip_columns=skip_columns,
+                               section_numbers=sections, status=status, incremental=incremental, **kwargs)
+        else:
+            _export.export_arrow(self, filename, file_format, skip_columns=skip_columns,
+                                 section_numbers=sections, status=status, **kwargs)
 
     def run_section(self, section, demo=False, parent_callbacks=True, from_section=None):
         """
@@ -506,15 +765,22 @@ class Experiment(ExperimentSection):
 
             if not demo:
                 section.has_finished = True
+                self._record(section)
 
             if parent_callbacks:
                 logger.debug('Exiting all parent levels...')
 
         # Finished parents detection.
         if not section.level == '_base':
-            for parent in reversed(list(self.parents(section))):
-                if all(child.has_finished for child in parent):
-                    parent.has_finished = True
+            parents = self.parents(section)
+            for i, parent in reversed(list(enumerate(parents))):
+                # Check the last children first, since sections are usually run in order.
+                if not all(child.has_finished for child in reversed(parent)):
+                    # Then the parents above can't have finished either.
+                    break
+                parent.has_finished = True
+                if not demo:
+                    self._record(parent, parents[:i])
 
     @contextmanager
     def _section_context(self, section, demo=False):
@@ -530,10 +796,90 @@ class Experiment(ExperimentSection):
             elif self.callback_type_by_level.get(section.level) == 'function':
                 results = self.callback_by_level[section.level](self, section)
                 if results and not demo:
-                    section.add_data(results)
+                    # Recorded along with the section having started, below.
+                    section.data.update(results)
+
+            if not demo:
+                self._record(section)
 
             yield
 
+    def _find_first(self, at_level, status, path_key):
+        # Sections can start and finish, but not the reverse,
+        # so a search for unstarted or unfinished sections can resume from where the last one left off.
+        if status == 'partially_run':
+            return self._search_first(at_level, status, path_key)
+
+        cursors = self._cursors.setdefault(status, {})
+        result = None
+        if at_level in cursors:
+            try:
+                result = self._resume_search(cursors[at_level], at_level, path_key)
+            except IndexError:
+                # The experiment was changed since the search, without the cursors being reset.
+                del cursors[at_level]
+        if result is None:
+            result = self._search_first(at_level, status, path_key)
+
+        if result is not None:
+            cursors[at_level] = self._positions(result)
+        return result
+
+    def _positions_changed(self):
+        self._cursors.clear()
+
+    def _positions(self, section):
+        # The index of each section on the path to `section` within its parent.
+        parents = self.parents(section)
+        positions = []
+        for parent, child in zip(parents, parents[1:] + [section]):
+            i = child.data[child.level] - 1
+            if not (0 <= i < len(parent) and parent._children[i] is child):
+                i = next(i for i, other in enumerate(parent) if other is child)
+            positions.append(i)
+        return positions
+
+    def _resume_search(self, positions, at_level, path_key):
+        key = lambda node: node.level == at_level
+        path = [self]
+        for i in positions:
+            path.append(path[-1]._children[i])
+
+        # Resume inside the section found last time, unless it or one of its parents no longer qualifies.
+        depth, inclusive = len(path) - 1, True
+        for d in range(1, len(path)):
+            if not path_key(path[d]):
+                depth, inclusive = d, False
+                break
+
+        # Then continue with the sections after it and after each of its parents.
+        while depth > 0:
+            start = positions[depth - 1] if inclusive else positions[depth - 1] + 1
+            for child in itertools.islice(path[depth - 1]._children, start, None):
+                if path_key(child):
+                    result = child.depth_first_search(key, path_key=path_key)
+                    if result:
+                        return result[-1]
+            depth, inclusive = depth - 1, False
+
+    def _search_first(self, at_level, status, path_key):
+        if self._index is None or at_level in self.local_levels:
+            return super()._find_first(at_level, status, path_key)
+
+        # Search the sections in memory, and use the index to search the rest without loading them.
+        key = lambda node: node.level == at_level
+        loaded = [child.data[child.level] for child in self if child.is_loaded]
+        numbers = self._index.find_first(at_level, status, exclude=loaded)
+        for child in self:
+            if numbers and child.data[child.level] == numbers[child.level]:
+                return self.subsection(**numbers)
+
+            # Sections whose children haven't been created yet aren't in the index.
+            if (child.is_loaded or _storage.is_deferred(child)) and path_key(child):
+                result = child.depth_first_search(key, path_key=path_key)
+                if result:
+                    return result[-1]
+
     @staticmethod
     def _parse_from_section(from_section):
         if isinstance(from_section, int):
@@ -633,23 +979,46 @@ class Experiment(ExperimentSection):
         self._callback_info[level] = [reference, args, kwargs]
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = super().__getstate__().copy()
         #  Clear session_data before pickling.
         state['session_data'] = {}
 
         # Clear functions.
         del state['callback_by_level']
 
+        state.pop('_index', None)
+        state.pop('_journaled_state', None)
+
+        return state
+
+    def _comparable_state(self):
+        state = super()._comparable_state()
+        state.pop('_journaled_state', None)
         return state
 
     def __setstate__(self, state):
-        self.__dict__.update(state)
+        super().__setstate__(state)
+        self.__dict__.setdefault('_cursors', {})
 
         # Reload callbacks.
         self.callback_by_level = {level: _callback_partial(*self._callback_info[level])
                                   for level in self._callback_info}
 
 
+def _draw_latin_squares(tree, rng, drawn=None):
+    # Latin squares are drawn when the tree is created, before the experiment's seed is known,
+    # so they're drawn again from the seed. The rows are the same in number, so the IVs above don't change.
+    if drawn is None:
+        drawn = set()
+    for level, designs in tree.levels_and_designs:
+        for design in [designs] if isinstance(designs, Design) else designs:  # The base level has a single Design.
+            if isinstance(design.ordering, order.LatinSquare) and id(design.ordering) not in drawn:
+                drawn.add(id(design.ordering))
+                design.ordering.first_pass(design.ordering.all_conditions, rng=rng)
+    for branch in tree.branches.values():
+        _draw_latin_squares(branch, rng, drawn)
+
+
 def _get_func_reference(func):
     if '__wrapped__' in func.__dict__:
         func = func.__wrapped__
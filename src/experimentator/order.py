@@ -22,7 +22,9 @@ import itertools
 import random
 import logging
 from collections import deque, namedtuple
+from collections.abc import Sequence
 from math import factorial
+import numpy as np
 from experimentator._util import ClassSchema
 
 logger = logging.getLogger(__name__)
@@ -30,6 +32,54 @@ logger = logging.getLogger(__name__)
 IndependentVariable = namedtuple('IndependentVariable', ('name', 'values'))
 
 
+class ConditionOrder(Sequence):
+    """
+    An order of conditions, as returned by |Ordering.get_order|.
+    It is a sequence of dictionaries, each mapping IV names to IV values,
+    but only the positions of the conditions are stored;
+    each dictionary is constructed (as a new copy) when it is accessed.
+
+    Parameters
+    ----------
+    conditions : sequence of dict
+        The conditions to order, for example a list or a |FullCross|.
+    indices : sequence of int, optional
+        The position in `conditions` of each condition in the order.
+        By default, the conditions are kept in order.
+    extra_data : dict, optional
+        Data to add to every condition.
+
+    """
+    def __init__(self, conditions, indices=None, extra_data=None):
+        if isinstance(conditions, ConditionOrder) and indices is None:
+            merged_extra_data = conditions.extra_data.copy()
+            merged_extra_data.update(extra_data or {})
+            conditions, indices, extra_data = conditions.conditions, conditions.indices, merged_extra_data
+
+        self.conditions = conditions
+        self.indices = range(len(conditions)) if indices is None else indices
+        self.extra_data = extra_data or {}
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, list(self))
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(first == second for first, second in zip(self, other))
+        return NotImplemented
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ConditionOrder(self.conditions, self.indices[index], self.extra_data)
+
+        condition = dict(self.conditions[self.indices[index]])
+        condition.update(self.extra_data)
+        return condition
+
+
 class Ordering:
     """
     The base ordering class.
@@ -79,11 +129,11 @@ class Ordering:
             Empty for atomic orderings.
 
         """
-        self.all_conditions = self.number * list(conditions)
+        self.all_conditions = self.number * _as_sequence(conditions)
 
         return IndependentVariable((), ())
 
-    def get_order(self, data=None):
+    def get_order(self, data=None, rng=None):
         """
         Get an order of conditions.
         For |Ordering|, always returns the same order.
@@ -93,15 +143,19 @@ class Ordering:
         data : dict, optional
             A dictionary describing the data of the parent section.
             Unused for atomic orderings.
+        rng : random.Random, optional
+            A random number generator.
+            Unused for |Ordering|, but random orderings draw their orders from it
+            (if not given, from the global generators of ``random`` and ``numpy.random``).
 
         Returns
         -------
-        list of dict
-            A list of conditions,
+        |ConditionOrder|
+            A sequence of conditions,
             where each condition is a dictionary mapping IV names to IV values.
 
         """
-        return self.all_conditions
+        return ConditionOrder(self.all_conditions)
 
     @staticmethod
     def possible_orders(conditions, unique=True):
@@ -120,9 +174,9 @@ class Ordering:
 
         """
         if unique:
-            unique_orders = set(tuple(p) for p in itertools.permutations(tuple(c.items()) for c in conditions))
-            for order in unique_orders:
-                yield list(dict(c) for c in order)
+            conditions = _as_sequence(conditions)
+            for order in set(itertools.permutations(_condition_codes(conditions))):
+                yield [dict(conditions[position]) for position in order]
         else:
             yield from itertools.permutations(conditions)
 
@@ -143,16 +197,69 @@ class Shuffle(Ordering):
         Conditions are duplicated *before* shuffling.
     avoid_repeats : bool, optional
         If True (default is False), no identical conditions will appear back-to-back.
+    max_run : int, optional
+        If given, no more than `max_run` identical conditions will appear in a row.
+        ``avoid_repeats=True`` is the same as ``max_run=1``.
+
+    Notes
+    -----
+    With `avoid_repeats` or `max_run`, orders are built one condition at a time,
+    choosing each condition at random (weighted by how many of it remain)
+    from those that leave a valid way to place the rest.
+    This is fast even with many duplicated conditions,
+    but it does not sample exactly uniformly from all valid orders.
+    If no valid order exists, `first_pass` raises a ``ValueError``.
 
     """
-    def __init__(self, number=1, avoid_repeats=False):
+    max_run = None
+
+    def __init__(self, number=1, avoid_repeats=False, max_run=None):
         super().__init__(number=number)
         self.avoid_repeats = avoid_repeats
+        self.max_run = max_run
 
     def __repr__(self):
-        return '{}(number={}, avoid_repeats={})'.format(self.__class__.__name__, self.number, self.avoid_repeats)
+        return '{}(number={}, avoid_repeats={}, max_run={})'.format(
+            self.__class__.__name__, self.number, self.avoid_repeats, self.max_run)
+
+    @property
+    def _max_run(self):
+        if self.avoid_repeats:
+            return 1
+        return self.max_run
 
-    def get_order(self, data=None):
+    def first_pass(self, conditions):
+        """
+        Handle operations that should only be performed once,
+        initializing the object before ordering conditions.
+        For |Shuffle|, the list of conditions is duplicated (if |Ordering.number| > 1),
+        and if repeats are limited, it is checked that a valid order exists.
+        This methods should not be called manually.
+
+        Parameters
+        ----------
+        conditions : sequence of dict
+            A list of conditions, where each condition is a dictionary mapping IV names to IV values.
+
+        Returns
+        -------
+        iv_name : str or tuple
+            The name of the IV, for non-atomic orderings.
+            Otherwise, an empty tuple.
+        iv_values : tuple
+            The possible values of the IV.
+            Empty for atomic orderings.
+
+        """
+        iv = super().first_pass(conditions)
+        if self._max_run is not None:
+            counts = _distinct_counts(self.all_conditions)[1]
+            if not _can_complete_runs(counts, None, 0, self._max_run):
+                raise ValueError('Cannot order the conditions with no more than {} identical conditions in a row'
+                                 .format(self._max_run))
+        return iv
+
+    def get_order(self, data=None, rng=None):
         """
         Get an order of conditions.
         For |Shuffle|, returns the conditions in a random order.
@@ -162,21 +269,21 @@ class Shuffle(Ordering):
         data : dict, optional
             A dictionary describing the data of the parent section.
             Unused for atomic orderings.
+        rng : random.Random, optional
+            The random number generator from which to draw the order.
+            If not given, the global generators of ``random`` and ``numpy.random`` are used.
 
         Returns
         -------
-        list of dict
-            A list of conditions,
+        |ConditionOrder|
+            A sequence of conditions,
             where each condition is a dictionary mapping IV names to IV values.
 
         """
-        conditions = self.all_conditions.copy()
-        random.shuffle(conditions)
-        if self.avoid_repeats:
-            while _has_repeats(conditions):
-                random.shuffle(conditions)
+        if self._max_run is not None:
+            return _shuffle_limiting_runs(self.all_conditions, self._max_run, rng=rng or random)
 
-        return conditions
+        return ConditionOrder(self.all_conditions, _permutation(len(self.all_conditions), rng))
 
 
 class NonAtomicOrdering(Ordering):
@@ -184,6 +291,8 @@ class NonAtomicOrdering(Ordering):
     This is a base class for non-atomic orderings, and is not meant to be directly instantiated.
     Non-atomic orderings work by creating a new independent variable one level up.
     The IV name will start with an underscore, a convention to avoid name clashes.
+    Each order is stored in ``order_ivs``, keyed by the value of the IV,
+    as a list of positions in ``all_conditions``.
 
     """
     iv_name = 'order'
@@ -209,7 +318,7 @@ class NonAtomicOrdering(Ordering):
         """
         return IndependentVariable(self.iv_name, list(self.order_ivs.keys()))
 
-    def get_order(self, data=None):
+    def get_order(self, data=None, rng=None):
         """
         Get an order of conditions.
 
@@ -217,15 +326,20 @@ class NonAtomicOrdering(Ordering):
         ----------
         data : dict, optional
             A dictionary describing the data of the parent section.
+        rng : random.Random, optional
+            Unused for non-atomic orderings, which are decided in advance.
 
         Returns
         -------
-        list of dict
-            A list of conditions,
+        |ConditionOrder|
+            A sequence of conditions,
             where each condition is a dictionary mapping IV names to IV values.
 
         """
-        return self.order_ivs[data[self.iv_name]]
+        order = self.order_ivs[data[self.iv_name]]
+        if order and isinstance(order[0], dict):  # Created by an older version, which stored the conditions.
+            return ConditionOrder(order)
+        return ConditionOrder(self.all_conditions, order)
 
 
 class CompleteCounterbalance(NonAtomicOrdering):
@@ -248,14 +362,29 @@ class CompleteCounterbalance(NonAtomicOrdering):
     For example, with 5 conditions there are 120 possible orders;
     with 3 conditions and ``number==2``, there are 90 unique orders.
 
+    The orders themselves are not stored.
+    Each value of the IV is the index of an order in the lexicographic order of all unique orders
+    (with conditions compared by their first position in the list of conditions),
+    and |CompleteCounterbalance.get_order| constructs the order from its index when it is needed.
+
     """
     iv_name = 'counterbalance_order'
 
+    def __init__(self, number=1):
+        super().__init__(number=number)
+        self.n_orders = 0
+
+    @property
+    def iv(self):
+        if self.order_ivs:  # Created by an older version, which stored every order.
+            return super().iv
+        return IndependentVariable(self.iv_name, range(self.n_orders))
+
     def first_pass(self, conditions):
         """
         Handle operations that should only be performed once,
         initializing the object before ordering conditions.
-        For |CompleteCounterbalance|, all possible orders are determined.
+        For |CompleteCounterbalance|, the number of possible orders is determined.
         This method should not be called manually.
 
         Parameters
@@ -273,18 +402,65 @@ class CompleteCounterbalance(NonAtomicOrdering):
             integers each associated with an order of the conditions.
 
         """
-        conditions = list(conditions)
-        self.all_conditions = self.number * conditions
+        self.all_conditions = self.number * _as_sequence(conditions)
+        self.order_ivs = {}
+
+        self.n_orders = factorial(len(self.all_conditions))
+        for count in _distinct_counts(self.all_conditions)[1]:
+            self.n_orders //= factorial(count)
 
-        # Warn because this might hang if this method is accidentally used with too many possible orders.
-        non_distinct_orders = factorial(len(self.all_conditions))
-        equivalent_orders = factorial(self.number)**len(conditions)
-        logger.warning("Creating IV '{}' with {} levels.".format(
-            self.iv_name, non_distinct_orders//equivalent_orders))
+        # Warn because the IV might be unexpectedly large.
+        logger.warning("Creating IV '{}' with {} levels.".format(self.iv_name, self.n_orders))
 
-        self.order_ivs = dict(enumerate(self.possible_orders(self.all_conditions)))
         return self.iv
 
+    def get_order(self, data=None, rng=None):
+        """
+        Get an order of conditions.
+        For |CompleteCounterbalance|, the order is constructed from its index, the value of the IV.
+
+        Parameters
+        ----------
+        data : dict, optional
+            A dictionary describing the data of the parent section.
+        rng : random.Random, optional
+            Unused for non-atomic orderings, which are decided in advance.
+
+        Returns
+        -------
+        |ConditionOrder|
+            A sequence of conditions,
+            where each condition is a dictionary mapping IV names to IV values.
+
+        """
+        if self.order_ivs:
+            return super().get_order(data, rng)
+
+        index = data[self.iv_name]
+        if not 0 <= index < self.n_orders:
+            raise IndexError('Counterbalance order {} out of range'.format(index))
+
+        distinct, counts = _distinct_counts(self.all_conditions)
+        n_remaining = len(self.all_conditions)
+        # The number of unique orders of the conditions not yet placed.
+        n_orders = self.n_orders
+        order = []
+        while n_remaining:
+            for i, count in enumerate(counts):
+                if not count:
+                    continue
+                # The number of orders of the remaining conditions that start with this condition.
+                n_starting = n_orders * count // n_remaining
+                if index < n_starting:
+                    break
+                index -= n_starting
+            order.append(distinct[i])
+            counts[i] -= 1
+            n_remaining -= 1
+            n_orders = n_starting
+
+        return ConditionOrder(self.all_conditions, order)
+
 
 class Sorted(NonAtomicOrdering):
     """
@@ -341,14 +517,13 @@ class Sorted(NonAtomicOrdering):
             Otherwise, empty tuple.
 
         """
-        self.all_conditions = self.number * list(conditions)
+        self.all_conditions = self.number * _as_sequence(conditions)
         if len(self.all_conditions[0]) > 1:
             raise ValueError("Ordering method 'Sorted' only works with one IV")
-        self.order_ivs = {'ascending': sorted(self.all_conditions,
-                                              key=lambda condition: list(condition.values())[0]),
-                          'descending': sorted(self.all_conditions,
-                                               key=lambda condition: list(condition.values())[0],
-                                               reverse=True)}
+        values = [list(condition.values())[0] for condition in self.all_conditions]
+        ascending = sorted(range(len(values)), key=values.__getitem__)
+        descending = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+        self.order_ivs = {'ascending': ascending, 'descending': descending}
 
         if self.order == 'both':
             logger.warning("Creating IV '{}' with levels 'ascending' and 'descending'.".format(self.iv_name))
@@ -356,7 +531,7 @@ class Sorted(NonAtomicOrdering):
         else:
             return IndependentVariable((), ())
 
-    def get_order(self, data=None):
+    def get_order(self, data=None, rng=None):
         """
         Get an order of conditions.
 
@@ -364,19 +539,19 @@ class Sorted(NonAtomicOrdering):
         ----------
         data : dict, optional
             A dictionary describing the data of the parent section.
+        rng : random.Random, optional
+            Unused for non-atomic orderings, which are decided in advance.
 
         Returns
         -------
-        list of dict
-            A list of conditions,
+        |ConditionOrder|
+            A sequence of conditions,
             where each condition is a dictionary mapping IV names to IV values.
 
         """
         if self.order == 'both':
-            order = data[self.iv_name]
-        else:
-            order = self.order
-        return self.order_ivs[order]
+            return super().get_order(data, rng)
+        return super().get_order({self.iv_name: self.order}, rng)
 
 
 class LatinSquare(NonAtomicOrdering):
@@ -393,44 +568,53 @@ class LatinSquare(NonAtomicOrdering):
     number : int, optional
         The number of times the Latin square should be repeated (default=1).
         Duplication occurs *after* constructing the square.
-    balanced : bool, optional
+    balanced : bool or 'williams', optional
         If True (the default), first-order order effects will be balanced
         Each condition will appear the same number of times
         immediately before and immediately after every other condition.
         Balanced latin squares can only be constructed with an even number of conditions.
-    uniform : bool, optional
+        If ``'williams'``, an odd number of conditions is balanced with a Williams design,
+        which has twice as many rows as conditions (see |balanced_latin_square|).
+    uniform : bool or 'markov', optional
         If True (default is False), the Latin square will be randomly sampled
         from a uniform distribution of Latin squares of size NxN.
+        If ``'markov'``, the Latin square will be sampled from an (approximately) uniform distribution
+        using a Markov chain (see |latin_square|), which is much faster for large squares.
         Otherwise, the sampling will be biased.
         The construction of balanced, uniform Latin squares is not implemented.
+    mixing_steps : int, optional
+        When `uniform` is ``'markov'``, the number of steps to run the Markov chain.
+        The default is ``N**3``.
 
     Notes
     -----
-    The algorithm for computing unbalanced Latin squares is not very efficient.
-    It is not recommended to construct unbalanced, uniform Latin squares of order above 5;
-    for non-uniform, unbalanced Latin squares it is safe to go up to an order of 10.
-    Higher than that, computation times increase rapidly.
+    The algorithm for computing unbalanced, uniform Latin squares is not very efficient.
+    It is not recommended to construct unbalanced, uniform Latin squares of order above 5
+    (unless `uniform` is ``'markov'``).
 
-    The algorithm for computing balanced Latin squares is fast only because it is not robust;
-    it is very biased and only samples from the same limited set of balanced Latin squares.
+    The algorithms for computing non-uniform and balanced Latin squares are fast only because they are not robust;
+    they are very biased and only sample from the same limited set of Latin squares.
     However, this is usually not an issue.
     For more implementation details, see |latin_square| and |balanced_latin_square|.
 
     """
     iv_name = 'latin_square_row'
 
-    def __init__(self, number=1, balanced=True, uniform=False):
+    def __init__(self, number=1, balanced=True, uniform=False, mixing_steps=None):
         if balanced and uniform:
             raise ValueError('Cannot create a balanced, uniform Latin square')
+        if uniform not in (True, False, 'markov'):
+            raise ValueError("uniform must be True, False, or 'markov'")
         super().__init__(number=number)
         self.balanced = balanced
         self.uniform = uniform
+        self.mixing_steps = mixing_steps
 
     def __repr__(self):
-        return '{}(number={}, balanced={}, uniform={})'.format(
-            self.__class__.__name__, self.number, self.balanced, self.uniform)
+        return '{}(number={}, balanced={}, uniform={!r}, mixing_steps={})'.format(
+            self.__class__.__name__, self.number, self.balanced, self.uniform, self.mixing_steps)
 
-    def first_pass(self, conditions):
+    def first_pass(self, conditions, rng=None):
         """
         Handle operations that should only be performed once,
         initializing the object before ordering conditions.
@@ -441,6 +625,10 @@ class LatinSquare(NonAtomicOrdering):
         conditions : sequence of dict
             A list of conditions,
             where each condition is a dictionary mapping IV names to IV values.
+        rng : random.Random, optional
+            The random number generator from which to draw the square.
+            By default, the global generator of the ``random`` module is used.
+            |Experiment.new| draws the square again from the experiment's seed.
 
         Returns
         -------
@@ -451,11 +639,11 @@ class LatinSquare(NonAtomicOrdering):
             integers each corresponding to one row of the Latin square.
 
         """
-        self.all_conditions = list(conditions)
+        self.all_conditions = _as_sequence(conditions)
         order = len(self.all_conditions)
 
         if self.balanced:
-            square = balanced_latin_square(order)
+            square = balanced_latin_square(order, williams=self.balanced == 'williams', rng=rng)
 
         else:
             if self.uniform:
@@ -465,20 +653,121 @@ class LatinSquare(NonAtomicOrdering):
             logger.warning('Constructing Latin square of order {} from a {}uniform distribution...'.format(
                 order, uniform_string))
 
-            square = latin_square(order, uniform=self.uniform, reduced=not self.uniform, shuffle=not self.uniform)
+            square = latin_square(order, uniform=self.uniform, reduced=not self.uniform, shuffle=not self.uniform,
+                                  mixing_steps=self.mixing_steps, rng=rng)
             logger.warning('Latin square construction complete.')
 
-        self.order_ivs = dict(enumerate(self.number * [self.all_conditions[i] for i in row] for row in square))
+        self.order_ivs = {i: self.number * list(row) for i, row in enumerate(square)}
 
-        logger.warning("Creating IV '{}' with {} levels.".format(self.iv_name, order))
+        logger.warning("Creating IV '{}' with {} levels.".format(self.iv_name, len(square)))
         return self.iv
 
 
-def _has_repeats(seq):
-    return any(first == second for first, second in zip(seq[:-1], seq[1:]))
+def _as_sequence(conditions):
+    # Conditions can be given by any iterable, but lazy sequences such as a FullCross are kept as they are.
+    if isinstance(conditions, Sequence):
+        return conditions
+    return list(conditions)
+
+
+def _permutation(n, rng=None):
+    # A random permutation of range(n). NumPy is much faster than random.shuffle for long orders,
+    # so for those a NumPy generator is seeded from `rng` (which takes longer than shuffling a short order).
+    if rng is None:
+        return np.random.permutation(n)
+    if n < 1000:
+        order = list(range(n))
+        rng.shuffle(order)
+        return order
+    return np.random.default_rng(rng.getrandbits(128)).permutation(n)
+
+
+def _shuffle_limiting_runs(conditions, max_run, rng=random):
+    # Randomly order `conditions` with no more than `max_run` identical conditions in a row.
+    # Conditions are chosen one at a time, weighted by how many of each remain,
+    # from those after which the rest can still be placed (see _can_complete_runs).
+    # That check is necessary but not always sufficient, so dead ends are backtracked from.
+    distinct, counts = _distinct_counts(conditions)
+    order = []
+    # For each position, the conditions not yet tried there, in the order they will be tried.
+    untried = []
+    while len(order) < len(conditions):
+        last = order[-1] if order else None
+        run = _run_length(order)
+        candidates = []
+        for i, count in enumerate(counts):
+            if not count or (i == last and run >= max_run):
+                continue
+            counts[i] -= 1
+            if _can_complete_runs(counts, i, run + 1 if i == last else 1, max_run):
+                candidates.append(i)
+            counts[i] += 1
+        # Weighted random order (Efraimidis & Spirakis), so that the first is chosen with probability ~ count.
+        candidates.sort(key=lambda i: rng.random() ** (1 / counts[i]), reverse=True)
+        untried.append(candidates)
+
+        while not untried[-1]:
+            untried.pop()
+            if not untried:
+                raise ValueError('Cannot order the conditions with no more than {} identical conditions in a row'
+                                 .format(max_run))
+            counts[order.pop()] += 1
+
+        i = untried[-1].pop(0)
+        order.append(i)
+        counts[i] -= 1
+
+    return ConditionOrder(conditions, [distinct[i] for i in order])
+
+
+def _run_length(seq):
+    # The number of identical elements at the end of `seq`.
+    run = 0
+    for element in reversed(seq):
+        if element != seq[-1]:
+            break
+        run += 1
+    return run
+
+
+def _can_complete_runs(counts, last, run, max_run):
+    # Whether elements with these counts can follow a run of `run` elements `last`,
+    # without more than `max_run` identical elements in a row.
+    # The other elements split each element into at most (number of others + 1) runs,
+    # the first of which continues the current run if the element is `last`.
+    remaining = sum(counts)
+    for i, count in enumerate(counts):
+        capacity = max_run * (remaining - count + 1)
+        if i == last:
+            capacity -= run
+        if count > capacity:
+            return False
+    return True
+
+
+def _condition_codes(conditions):
+    # Code each condition by the position of the first condition equal to it.
+    # Conditions are compared by hashing their items, or one by one if they have unhashable values.
+    codes = []
+    first_positions = {}
+    for position, condition in enumerate(conditions):
+        try:
+            key = frozenset(condition.items())
+        except TypeError:
+            codes.append(next((codes[other] for other in range(position) if conditions[other] == condition),
+                              position))
+        else:
+            codes.append(first_positions.setdefault(key, position))
+    return codes
 
 
-def latin_square(order, reduced=False, uniform=True, shuffle=False):
+def _distinct_counts(conditions):
+    # The positions of the distinct conditions, in order of first appearance, and the number of times each appears.
+    distinct, counts = np.unique(_condition_codes(conditions), return_counts=True)
+    return distinct.tolist(), counts.tolist()
+
+
+def latin_square(order, reduced=False, uniform=True, shuffle=False, mixing_steps=None, rng=None):
     """
     Constructs a Latin square of size `order` x `order`.
     Each row and column will contain every element of ``range(order)`` exactly once.
@@ -491,8 +780,10 @@ def latin_square(order, reduced=False, uniform=True, shuffle=False):
         If True (default is False),
         the first row and first column of the square will be the ``list(range(order))``,
         unless `shuffle` is also True.
-    uniform : bool, optional
+    uniform : bool or 'markov', optional
         If True (the default), the Latin square will be sampled from a uniform distribution of Latin squares.
+        If ``'markov'``, it will be sampled using the Markov chain of Jacobson and Matthews,
+        which is approximately uniform after enough steps, and much faster for large squares.
         Set to False to relax this constraint and allow for a faster run time.
     shuffle : bool, optional
         If True (default is False),
@@ -500,6 +791,10 @@ def latin_square(order, reduced=False, uniform=True, shuffle=False):
         then its columns, and then the elements will be randomly permuted.
         Shuffling is irrelevant when `uniform` is True.
         Otherwise, it adds some randomness, though the resulting Latin square will still be biased.
+    mixing_steps : int, optional
+        When `uniform` is ``'markov'``, the number of steps to run the Markov chain (default ``order**3``).
+    rng : random.Random, optional
+        The random number generator to use. By default, the global generator of the ``random`` module is used.
 
     Returns
     -------
@@ -513,13 +808,27 @@ def latin_square(order, reduced=False, uniform=True, shuffle=False):
 
     Notes
     -----
-    This function uses a naive algorithm to construct latin squares,
-    randomly generating elements and starting over whenever a collision is encountered.
-    It will take a long time to construct Latin squares of order 5,
-    when sampling from a uniform distribution.
-    However, if a uniform distribution is not required,
-    it is recommended to also set `reduced` and `shuffle` to True for fastest run times.
-    In this case, latin squares up to an order of about 10 can be constructed in a reasonable amount of time.
+    To sample from a uniform distribution,
+    this function uses a naive algorithm to construct latin squares,
+    randomly generating rows and starting over whenever a collision is encountered.
+    It will take a long time to construct Latin squares of order 5 this way.
+
+    If a uniform distribution is not required,
+    a cyclic Latin square (each row shifted one place from the previous) is constructed,
+    and then its rows, columns, and elements are randomly permuted (and then put back in order if `reduced`).
+    This takes time proportional to ``order**2``, but only produces Latin squares that are equivalent to the cyclic one.
+
+    With ``uniform='markov'``, the Markov chain of Jacobson and Matthews [1]_ is run from a cyclic Latin square.
+    Each step takes constant time, so squares of order 30 take a fraction of a second.
+    The chain passes through 'improper' squares; if it is in one after `mixing_steps` steps,
+    it continues until it is in a proper square after a further multiple of ``order**2`` steps.
+    Reduced squares are obtained by permuting the symbols and rows of the sampled square,
+    which preserves the uniformity of the distribution.
+
+    References
+    ----------
+    .. [1] Jacobson, M. T., & Matthews, P. (1996). Generating uniformly distributed random Latin squares.
+       Journal of Combinatorial Designs, 4(6), 405-437.
 
     Examples
     --------
@@ -538,37 +847,48 @@ def latin_square(order, reduced=False, uniform=True, shuffle=False):
       [4, 3, 0, 1, 2]]  #random
 
     """
+    rng = rng or random
+    if uniform == 'markov':
+        square = _markov_latin_square(order, order**3 if mixing_steps is None else mixing_steps, rng)
+        if reduced:
+            square = _reduce_latin_square(square)
+        if shuffle:
+            square = _shuffle_latin_square(square, rng=rng)
+        return square
+
+    if not uniform:
+        square = _shuffle_latin_square(_cyclic_latin_square(order), rng=rng)
+        if reduced:
+            square = _reduce_latin_square(square)
+        if shuffle:
+            square = _shuffle_latin_square(square, rng=rng)
+        return square
+
     numbers = list(range(order))
     square = []
     if reduced:
         while not _is_latin_rect(square):
             square = [numbers]   # To get a uniform sampling of latin squares, we must start over every time.
             for row in range(1, order):
-                square.append(_new_row(order, reduced_row=row))
-                if uniform and not _is_latin_rect(square):
+                square.append(_new_row(order, reduced_row=row, rng=rng))
+                if not _is_latin_rect(square):
                     break
-                elif not uniform:
-                    while not _is_latin_rect(square):
-                        square[-1] = _new_row(order, reduced_row=row)
 
     else:  # Not reduced.
         while not _is_latin_rect(square):
             square = []
             for _ in range(order):
-                square.append(_new_row(order))
-                if uniform and not _is_latin_rect(square):
+                square.append(_new_row(order, rng=rng))
+                if not _is_latin_rect(square):
                     break
-                elif not uniform:
-                    while not _is_latin_rect(square):
-                        square[-1] = _new_row(order)
 
     if shuffle:
-        _shuffle_latin_square(square)
+        _shuffle_latin_square(square, rng=rng)
 
     return square
 
 
-def balanced_latin_square(order):
+def balanced_latin_square(order, williams=False, rng=None):
     """
     Constructs a row-balanced latin square of order `order`.
     In a row-balanced Latin square, immediate order effects are accounted for.
@@ -580,12 +900,20 @@ def balanced_latin_square(order):
     ----------
     order : int
         Order of the Latin square to construct.
-        Must be even.
+        Must be even, unless `williams` is True.
+    williams : bool, optional
+        If True (default is False) and `order` is odd, construct a Williams design instead:
+        a Latin square followed by the same square with each row reversed.
+        No single Latin square of odd order is balanced,
+        but in the two together every two-element sequence occurs twice.
+    rng : random.Random, optional
+        The random number generator to use. By default, the global generator of the ``random`` module is used.
 
     Returns
     -------
     array-like
-        A balanced Latin square of size `order` x `order`.
+        A balanced Latin square of size `order` x `order`,
+        or for a Williams design with an odd `order`, a rectangle of size ``2 * order`` x `order`.
 
     See Also
     --------
@@ -612,7 +940,7 @@ def balanced_latin_square(order):
      [3, 4, 5, 1, 2, 0]]  # random
 
     """
-    if order % 2:
+    if order % 2 and not williams:
         raise ValueError('Cannot compute a balanced Latin square with an odd order')
 
     original_numbers = range(order)
@@ -620,8 +948,9 @@ def balanced_latin_square(order):
     for first, last in zip(original_numbers[2:], reversed(original_numbers[2:])):
         column_starts.append(last)
         column_starts.append(first)
-        if len(column_starts) == order:
+        if len(column_starts) >= order:
             break
+    column_starts = column_starts[:order]
 
     square = []
     for start in column_starts:
@@ -631,37 +960,123 @@ def balanced_latin_square(order):
     square = list(zip(*square))
     square = [list(row) for row in square]
 
-    return _shuffle_latin_square(square, shuffle_columns=False)
+    rng = rng or random
+    square = _shuffle_latin_square(square, shuffle_columns=False, rng=rng)
+    if order % 2:
+        square.extend([list(reversed(row)) for row in square])
+        rng.shuffle(square)
+    return square
 
 
-def _shuffle_latin_square(square, shuffle_columns=True, shuffle_rows=True, shuffle_items=True):
+def _shuffle_latin_square(square, shuffle_columns=True, shuffle_rows=True, shuffle_items=True, rng=random):
     order = len(square)
 
     if shuffle_rows:
-        random.shuffle(square)
+        rng.shuffle(square)
 
     if shuffle_columns:
         square = list(zip(*square))
-        random.shuffle(square)
+        rng.shuffle(square)
         square = list(zip(*square))
         square = [list(row) for row in square]
 
     if shuffle_items:
         new_factors = list(range(order))
-        random.shuffle(new_factors)
-        new_square = []
-        for row in square:
-            new_row = row.copy()
-            for original_factor, new_factor in zip(range(order), new_factors):
-                new_row[row.index(original_factor)] = new_factor
-            new_square.append(new_row)
-        square = new_square
+        rng.shuffle(new_factors)
+        square = [[new_factors[factor] for factor in row] for row in square]
 
     assert(_is_latin_rect(square))
 
     return square
 
 
+def _cyclic_latin_square(order):
+    return [[(row + column) % order for column in range(order)] for row in range(order)]
+
+
+def _markov_latin_square(order, steps, rng=random):
+    # The Markov chain of Jacobson & Matthews (1996), in which a Latin square is an order x order x order array
+    # with one 1 in each line (and 0 elsewhere), i.e. cube[row][column][symbol] == 1 iff square[row][column] == symbol.
+    # Each move changes a 2x2x2 subcube. The move can leave a -1 in the cube (an 'improper' square),
+    # which the following moves remove.
+    # To make each move take constant time, the positions of the 1s in each line of the cube are kept in lists:
+    # symbols[row, column], columns[row, symbol] and rows[column, symbol].
+    # The cube and the lines are stored in flat lists, indexed e.g. by row * order + column.
+    # If the square is improper after `steps` moves, it is checked again every order**2 moves.
+    # (Stopping at the first proper square would bias the result towards squares that are often reached that way.)
+    n = order
+    if n == 1:
+        # There are no moves; the only Latin square of order 1 is [[0]].
+        return [[0]]
+    cube = [0] * n**3
+    symbols = [None] * n**2
+    columns = [None] * n**2
+    rows = [None] * n**2
+    for row, symbols_in_row in enumerate(_cyclic_latin_square(n)):
+        for column, symbol in enumerate(symbols_in_row):
+            cube[(row * n + column) * n + symbol] = 1
+            symbols[row * n + column] = [symbol]
+            columns[row * n + symbol] = [column]
+            rows[column * n + symbol] = [row]
+
+    def change(row, column, symbol, delta):
+        i = (row * n + column) * n + symbol
+        old = cube[i]
+        cube[i] = old + delta
+        if old == 1:
+            symbols[row * n + column].remove(symbol)
+            columns[row * n + symbol].remove(column)
+            rows[column * n + symbol].remove(row)
+        elif old + delta == 1:
+            symbols[row * n + column].append(symbol)
+            columns[row * n + symbol].append(column)
+            rows[column * n + symbol].append(row)
+
+    randrange = rng.randrange
+    choice = rng.choice
+    improper = None
+    step = 0
+    while step < steps or improper or (step - steps) % n**2:
+        if improper is None:
+            # Choose a 0 in the cube.
+            row, column = randrange(n), randrange(n)
+            other_symbol, = symbols[row * n + column]
+            symbol = randrange(n - 1)
+            if symbol >= other_symbol:
+                symbol += 1
+            other_row, = rows[column * n + symbol]
+            other_column, = columns[row * n + symbol]
+        else:
+            # Start from the -1. Each of its lines has two 1s; choose one of each.
+            row, column, symbol = improper
+            other_row = choice(rows[column * n + symbol])
+            other_column = choice(columns[row * n + symbol])
+            other_symbol = choice(symbols[row * n + column])
+
+        change(row, column, symbol, 1)
+        change(row, other_column, other_symbol, 1)
+        change(other_row, column, other_symbol, 1)
+        change(other_row, other_column, symbol, 1)
+        change(row, column, other_symbol, -1)
+        change(row, other_column, symbol, -1)
+        change(other_row, column, symbol, -1)
+        change(other_row, other_column, other_symbol, -1)
+
+        if cube[(other_row * n + other_column) * n + other_symbol] == -1:
+            improper = other_row, other_column, other_symbol
+        else:
+            improper = None
+        step += 1
+
+    return [[symbols[row * n + column][0] for column in range(n)] for row in range(n)]
+
+
+def _reduce_latin_square(square):
+    # Relabel the symbols so that the first row is in order, then sort the rows by their first element.
+    relabel = {symbol: i for i, symbol in enumerate(square[0])}
+    return sorted([[relabel[symbol] for symbol in row] for row in square], key=lambda row: row[0])
+
+
 def _is_latin_rect(matrix):
     if not matrix:
         return False
@@ -669,17 +1084,17 @@ def _is_latin_rect(matrix):
             all(len(set(column)) == len(column) for column in zip(*matrix)))
 
 
-def _new_row(order, reduced_row=None):
+def _new_row(order, reduced_row=None, rng=random):
     numbers = list(range(order))
     if reduced_row is not None:
         new_row = [reduced_row]
         remaining_numbers = list(set(numbers) - set(new_row))
-        random.shuffle(remaining_numbers)
+        rng.shuffle(remaining_numbers)
         new_row.extend(remaining_numbers)
 
     else:
         new_row = numbers.copy()
-        random.shuffle(new_row)
+        rng.shuffle(new_row)
 
     return new_row
 
@@ -1,10 +1,15 @@
 """
-This module contains the |ExperimentSection| class, which is imported in `__init__.py`.
+This module contains the |ExperimentSection| class, which is imported in `__init__.py`,
+and |SectionData|, the type of |ExperimentSection.data|.
 
 """
 import collections
 import itertools
+import random
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
 import networkx as nx
+import numpy as np
 
 
 class ExperimentSection:
@@ -32,7 +37,8 @@ class ExperimentSection:
     Attributes
     ----------
     tree : |DesignTree|
-    data : |ChainMap|
+    data : |SectionData|
+        A |ChainMap|-like view of the data associated with this section and its parents.
     description : str
         The name and number of the section (e.g., ``'trial 3'``).
     dataframe : |DataFrame|
@@ -53,6 +59,12 @@ class ExperimentSection:
         Whether this section has started to be run.
     has_finished : bool
         Whether this section has finished running.
+    is_loaded : bool
+        False if this section's descendants are still on disk, or haven't been created yet.
+        Sections loaded lazily (e.g., from an experiment saved as a directory)
+        only load their descendants when they are first accessed,
+        and sections created lazily (see |ExperimentSection.new|)
+        only create them when they are first accessed.
 
     Notes
     -------
@@ -62,15 +74,56 @@ class ExperimentSection:
     This better corresponds to the language commonly used by scientists to identify participants, trials, etc.
 
     """
-    def __init__(self, tree, data=None, has_started=False, has_finished=False, _children=None):
+    # Experiments can have millions of sections, so they're kept small.
+    __slots__ = (
+        'tree', 'has_started', 'has_finished',
+        '_children',
+        # Where to load the children from, if they haven't been loaded yet.
+        '_source',
+        # The section this section is a child of. Not saved; see __setstate__ and parents.
+        '_parent',
+        # Maps (level, number) to children, for finding sections by number. Built when needed.
+        '_children_by_number',
+        # The section's own data: the index of a row in `_table`, which is shared with its siblings,
+        # or a dict if `_table` is None (e.g., sections without a parent).
+        '_local', '_table',
+        # Data inherited by sections without a parent, e.g. created from a ChainMap.
+        '_inherited',
+    )
+
+    def __init__(self, tree, data=None, has_started=False, has_finished=False, _children=None, _parent=None):
         self.tree = tree
-        self.data = data or collections.ChainMap()
+        self._parent = _parent
+        self._source = None
+        self._children_by_number = None
+        if _parent is None:
+            self.data = data
+        else:
+            self._table = _parent._children_table()
+            self._local = self._table.row(data or {})
+            self._inherited = None
         self.has_started = has_started
         self.has_finished = has_finished
-        self._children = collections.deque() if _children is None else _children
+        if _children is None:
+            _children = () if self.is_bottom_level else collections.deque()
+        self._children = _children
+        self._link_children()
+
+    @property
+    def data(self):
+        return SectionData(self)
+
+    @data.setter
+    def data(self, data):
+        if data is None:
+            data = {}
+        maps = getattr(data, 'maps', [data])
+        self._local = maps[0]
+        self._table = None
+        self._inherited = collections.ChainMap(*maps[1:]) if len(maps) > 1 else None
 
     @classmethod
-    def new(cls, tree, data=None):
+    def new(cls, tree, data=None, lazy=False, _parent=None):
         """Create a new |ExperimentSection|.
 
         Parameters
@@ -86,16 +139,73 @@ class ExperimentSection:
             `data` should be a  |collections.ChainMap|,
             which behaves like a dictionary but has a hierarchical organization such that
             children can access values from the parent but not vice-versa.
+        lazy : bool, optional
+            If True (default is False), the section's children are not created
+            until they are first accessed (e.g., when the section is iterated or run),
+            and the same goes for their children, and so on.
+            Either way, the children are ordered with a random number generator
+            seeded from the experiment's seed (see |Experiment.new|) and the section's position in the tree,
+            so they are ordered the same way whenever they are created.
 
         """
-        self = cls(tree, data)
+        self = cls(tree, data) if _parent is None else cls(tree, data, _parent=_parent)
         if not self.is_bottom_level:
-            # Create the section tree. Creating any section also creates the sections below it.
-            self.append_design_tree(self.get_next_tree(), _renumber=False)
-            self._number_children()
+            del self._children
+            self._source = DeferredChildren()
+            if not lazy:
+                self._create_descendants()
 
         return self
 
+    def _create_descendants(self, processes=None):
+        # Create the sections below this one. Accessing the children of a section creates them.
+        if processes and not self.is_bottom_level:
+            return self._create_descendants_in_parallel(processes)
+        sections = [self]
+        while sections:
+            sections.extend(sections.pop()._children)
+
+    def _create_descendants_in_parallel(self, processes):
+        # Create the children here, so that they're ordered here (including by non-atomic orderings),
+        # and the descendants of each child in one of `processes` worker processes.
+        # The workers order each section with the same generator as it would be ordered with here (see _rng).
+        root, positions = self._path()
+        seed = getattr(root, 'seed', None)
+        if seed is None:
+            # Otherwise each worker would choose its own.
+            seed = np.random.SeedSequence().entropy
+        spawn_key = getattr(root, 'spawn_key', ()) + tuple(positions)
+        children = [child for child in self._children if not child.is_loaded]
+        if not children:
+            return
+        keys = [spawn_key + (i,) for i, child in enumerate(self._children) if not child.is_loaded]
+
+        with ProcessPoolExecutor(processes) as executor:
+            results = executor.map(_create_subtree,
+                                   [child.tree for child in children], [dict(child.data) for child in children],
+                                   itertools.repeat(seed), keys,
+                                   chunksize=max(1, len(children) // (4 * processes)))
+            for child, grandchildren in zip(children, results):
+                child._load(grandchildren)
+
+    def __getattr__(self, name):
+        # Only called when normal attribute lookup fails, i.e. for children that haven't been loaded yet.
+        if name == '_children' and self._source is not None:
+            self._load(self._source.load_children(self))
+            return self._children
+
+        raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+
+    def _load(self, children):
+        self._children = children
+        self._source = None
+        self._link_children()
+        self._children_by_number = None
+
+    @property
+    def is_loaded(self):
+        return self._source is None
+
     @property
     def level(self):
         return self.tree[0].name
@@ -115,8 +225,101 @@ class ExperimentSection:
     @property
     def dataframe(self):
         from pandas import DataFrame
-        data = DataFrame(section.data for section in self.walk() if section.is_bottom_level)
-        return data.set_index(self.levels)
+        columns, levels = self._data_columns()
+        # Sort the columns, as pandas did when this was built from a ChainMap per trial.
+        data = DataFrame({key: columns[key] for key in sorted(columns)})
+        return data.set_index(levels)
+
+    def _data_columns(self, missing=float('nan')):
+        # Gather the data of every bottom-level section below this one, by column.
+        # Values missing from a row are replaced by `missing`.
+        if self.is_bottom_level:
+            return {key: [value] for key, value in self.data.items()}, []
+
+        levels = {}
+        (columns, _), = self._data_chunks(None, missing=missing, levels=levels)
+        return columns, list(levels)
+
+    def _data_chunks(self, chunk_size, missing=float('nan'), levels=None, status=None):
+        # Yield the data of the bottom-level sections below this one in order, as (columns, n_rows),
+        # in chunks of at least `chunk_size` rows (or all at once if `chunk_size` is None).
+        # The names of the levels below this section are added to `levels` (a dict used as an ordered set).
+        # See _data_groups for `status`.
+        columns = {}
+        n_rows = 0
+        any_yielded = False
+        for siblings, ancestors in self._data_groups(levels, status=status):
+            n = len(siblings)
+            for key, values in _group_columns(siblings, ancestors).items():
+                if key not in columns:
+                    columns[key] = [MISSING] * n_rows
+                columns[key].extend(values)
+            n_rows += n
+            for values in columns.values():
+                if len(values) < n_rows:
+                    values.extend(MISSING for _ in range(n_rows - len(values)))
+
+            if chunk_size is not None and n_rows >= chunk_size:
+                yield self._fill_data_columns(columns, n_rows, missing), n_rows
+                any_yielded = True
+                columns = {}
+                n_rows = 0
+
+        if n_rows or not any_yielded:
+            yield self._fill_data_columns(columns, n_rows, missing), n_rows
+
+    def _data_groups(self, levels=None, status=None):
+        # Yield the bottom-level sections below this one in order, grouped with their siblings,
+        # as (siblings, ancestors), where `ancestors` are the siblings' ancestors below this section, nearest last.
+        # Sibling sections store their data in the same table, so each column of a group of siblings
+        # (and of their parents' table, and so on) can be read all at once.
+        # If `status` is 'started' or 'finished', only sections that have started or finished are included.
+        if levels is None:
+            levels = {}
+        if status == 'finished':
+            include = lambda section: section.has_finished
+        elif status == 'started':
+            include = lambda section: section.has_started
+        else:
+            include = None
+
+        stack = [(self, ())]
+        while stack:
+            section, ancestors = stack.pop()
+            if section.is_bottom_level:
+                if include is None or include(section):
+                    yield [section], ancestors[:-1]
+                continue
+            if include is not None and isinstance(section._source, DeferredChildren):
+                # None of its descendants have been created, let alone run.
+                continue
+
+            children = section._children
+            levels.update(dict.fromkeys(child.level for child in children))
+            if not children:
+                continue
+            if all(child.is_bottom_level for child in children):
+                # Each section is checked, since a section can finish without all of its children being run
+                # (see the `from_section` argument of Experiment.run_section).
+                if include is not None:
+                    children = [child for child in children if include(child)]
+                    if not children:
+                        continue
+                yield children, ancestors
+            else:
+                stack.extend((child, ancestors + (child,)) for child in reversed(children))
+
+    def _fill_data_columns(self, columns, n_rows, missing):
+        # Data from this section and above applies to every row.
+        for key, value in self.data.items():
+            values = columns.setdefault(key, [MISSING] * n_rows)
+            columns[key] = [value if v is MISSING else v for v in values]
+
+        for key, values in columns.items():
+            if any(value is MISSING for value in values):
+                columns[key] = [missing if value is MISSING else value for value in values]
+
+        return columns
 
     @property
     def levels(self):
@@ -159,11 +362,59 @@ class ExperimentSection:
             # Workaround pandas issue
             # https://github.com/pydata/pandas/issues/7830
             try:
-                return self.__dict__ == other.__dict__
+                return self._comparable_state() == other._comparable_state()
             except ValueError:
                 return False
         return False
 
+    def _comparable_state(self):
+        state = ExperimentSection.__getstate__(self)
+        for name in ('_local', '_table', '_inherited'):
+            state.pop(name, None)
+        state['data'] = self.data
+        return state
+
+    def __getstate__(self):
+        # The parent link would make saving a section recurse through the whole tree,
+        # and the index of children can be rebuilt.
+        state = dict(getattr(self, '__dict__', {}))  # Attributes of subclasses.
+        state.update(tree=self.tree, has_started=self.has_started, has_finished=self.has_finished,
+                     _local=self._local)
+        if self.is_loaded:
+            state['_children'] = self._children
+        else:
+            state['_source'] = self._source
+        if self._table is not None:
+            state['_table'] = self._table
+        if self._inherited is not None:
+            state['_inherited'] = self._inherited
+        return state
+
+    def __setstate__(self, state):
+        self._source = self._parent = self._children_by_number = self._table = self._inherited = None
+        for name, value in state.items():
+            # Files saved by older versions store the data of all parents in a ChainMap under 'data'.
+            setattr(self, name, value)
+        self._link_children()
+
+    def _link_children(self):
+        if not self.is_loaded or not self._children:
+            return
+
+        table = self._children_table()
+        for child in self._children:
+            child._parent = self
+            child._inherited = None
+            if child._table is not table:
+                # Move the child's data into the table shared with its siblings.
+                child._local = table.row(child.data.maps[0])
+                child._table = table
+
+    def _children_table(self):
+        if self._children and self._children[0]._table is not None:
+            return self._children[0]._table
+        return DataTable()
+
     def _add_to_graph(self, graph, id_list=None):
         parent_id_list = id_list or []
         id_list = parent_id_list + [self._solo_id]
@@ -205,7 +456,7 @@ class ExperimentSection:
             return next_tree[self.data[self.heterogeneous_design_iv_name]]
         return next_tree
 
-    def append_design_tree(self, tree, to_start=False, _renumber=True):
+    def append_design_tree(self, tree, to_start=False, lazy=False, _renumber=True):
         """
         Append all sections associated with the top level of a |DesignTree|
         (and therefore also create descendant sections) to the |ExperimentSection|.
@@ -217,6 +468,9 @@ class ExperimentSection:
         to_start : bool, optional
             If True, the sections will be inserted at the beginning of the section.
             If False (the default), they will be appended to the end.
+        lazy : bool, optional
+            If True (default is False), the descendants of the new sections
+            are only created when they are first accessed (see |ExperimentSection.new|).
 
         Notes
         -----
@@ -230,20 +484,29 @@ class ExperimentSection:
         if self.level == level:
             raise ValueError('DesignTree to be appended is at the same level as the current section')
 
+        n_children = len(self._children)
+        rng = self._rng()
         if to_start:
             for design in reversed(designs):
-                for new_data in reversed(design.get_order(self.data)):
-                    self.append_child(new_data, tree=tree, to_start=True, _renumber=False)
+                for new_data in reversed(design.get_order(self.data, rng)):
+                    self.append_child(new_data, tree=tree, to_start=True, lazy=True, _renumber=False)
 
         else:
             for design in designs:
-                for new_data in design.get_order(self.data):
-                    self.append_child(new_data, tree=tree, _renumber=False)
+                for new_data in design.get_order(self.data, rng):
+                    self.append_child(new_data, tree=tree, lazy=True, _renumber=False)
 
         if _renumber:
             self._number_children()
 
-    def append_child(self, data, tree=None, to_start=False, _renumber=True):
+        if not lazy:
+            # Now that the new sections are in place, create their descendants.
+            n_new = len(self._children) - n_children
+            start = 0 if to_start else n_children
+            for child in itertools.islice(self._children, start, start + n_new):
+                child._create_descendants()
+
+    def append_child(self, data, tree=None, to_start=False, lazy=False, _renumber=True):
         """
         Create a new |ExperimentSection| (and its descendants)
         and append it as a child of the current |ExperimentSection|.
@@ -260,6 +523,9 @@ class ExperimentSection:
         to_start : bool, optional
             If True, the new |ExperimentSection| will be appended to the beginning of the current section.
             If False (the default), it will be appended to the end.
+        lazy : bool, optional
+            If True (default is False), the descendants of the new section
+            are only created when they are first accessed (see |ExperimentSection.new|).
 
         Notes
         -----
@@ -271,10 +537,8 @@ class ExperimentSection:
         if not tree:
             tree = self.get_next_tree()
 
-        child_data = self.data.new_child()
-        child_data.update(data)
-
-        child = ExperimentSection.new(tree, child_data)
+        child = ExperimentSection.new(tree, data, lazy=True, _parent=self)
+        self._children_by_number = None
         if to_start:
             self._children.appendleft(child)
         else:
@@ -283,11 +547,65 @@ class ExperimentSection:
         if _renumber:
             self._number_children()
 
+        if not lazy:
+            # The child's descendants are ordered according to its position, so they're created once it's in place.
+            child._create_descendants()
+
+    def _rng(self):
+        # The random number generator with which new children are ordered.
+        # Like those from numpy.random.SeedSequence.spawn, each section's generator is identified
+        # by a spawn key: here, the section's position within its parent, prefixed by its parent's position, etc.,
+        # and suffixed by the number of children it already has (0, unless sections are appended to it later).
+        # So any part of the experiment is ordered the same way however and wherever it's created.
+        root, positions = self._path()
+        spawn_key = getattr(root, 'spawn_key', ()) + tuple(positions) + (len(self._children),)
+        return _seeded_rng(getattr(root, 'seed', None), spawn_key)
+
+    def _path(self):
+        # The section at the root of the tree, and the position of each section on the path from there.
+        positions = []
+        section = self
+        while section._parent is not None:
+            siblings = section._parent._children
+            i = section.data.get(section.level, 0) - 1
+            if not (0 <= i < len(siblings) and siblings[i] is section):
+                i = next(i for i, other in enumerate(siblings) if other is section)
+            positions.append(i)
+            section = section._parent
+        return section, positions[::-1]
+
     def _number_children(self):
+        self._assign_numbers()
+        self._positions_changed()
+
+    def _assign_numbers(self):
         for level in self.local_levels:
             children_at_level = [child for child in self if child.level == level]
             for i, child in enumerate(children_at_level):
                 child.data.update({level: i + 1})
+        self._children_by_number = None
+
+    def _positions_changed(self):
+        # Called when children are added, removed or moved; the Experiment at the root caches positions of sections.
+        if self._parent is not None:
+            self._parent._positions_changed()
+
+    def _data_added(self, section):
+        # Called when data is added to `section`; the Experiment at the root records it when journaling.
+        if self._parent is not None:
+            self._parent._data_added(section)
+
+    def _numbered_child(self, level, number):
+        """
+        Find a child by its level and section number, without searching.
+
+        """
+        if self._children_by_number is None:
+            self._children_by_number = {(child.level, child.data[child.level]): child for child in self}
+        try:
+            return self._children_by_number[level, number]
+        except KeyError:
+            raise IndexError('{} has no {} {}'.format(self.description, level, number)) from None
 
     def add_data(self, data):
         """
@@ -302,6 +620,7 @@ class ExperimentSection:
 
         """
         self.data.update(data)
+        self._data_added(self)
 
     def subsection(self, **section_numbers):
         """
@@ -332,14 +651,37 @@ class ExperimentSection:
         >>> some_block = exp.subsection(participant=2, session=1, block=3)
 
         """
+        # Go straight down while the numbers of the next level are given.
+        section = self
+        remaining_numbers = section_numbers.copy()
+        while remaining_numbers and not section.is_bottom_level:
+            level = section._child_level()
+            if level not in remaining_numbers:
+                break
+            try:
+                section = section._numbered_child(level, remaining_numbers.pop(level))
+            except IndexError:
+                raise ValueError('Could not find specified section.') from None
+        if not remaining_numbers:
+            return section
+
         key = lambda node: all(level in node.data and node.data[level] == number
                                for level, number in section_numbers.items())
-        result = self.depth_first_search(key)
+        # Don't descend into sections that are already numbered differently.
+        path_key = lambda node: all(node.data.get(level, number) == number
+                                    for level, number in section_numbers.items())
+        result = section.depth_first_search(key, path_key=path_key)
         if result:
             return result[-1]
 
         raise ValueError('Could not find specified section.')
 
+    def _child_level(self):
+        # The level of the section's children. Past the main levels, it depends on which branch the section takes.
+        if len(self.tree.levels_and_designs) > 1:
+            return self.tree[1][0]
+        return self.get_next_tree()[0][0]
+
     def all_subsections(self, **section_numbers):
         """
         Find all subsections in the experiment matching the given section numbers.
@@ -383,22 +725,24 @@ class ExperimentSection:
         # The state of the recursion is passed in the keyword argument '_section'.
         section = section_numbers.pop('_section', self)
 
-        if not section.is_bottom_level and section.tree[1][0] in section_numbers:
+        level = None if section.is_bottom_level else section._child_level()
+        if level in section_numbers:
             # Remove the section from section_numbers...it needs to be empty to signal completion.
-            numbers = section_numbers.pop(section.tree[1][0])
+            numbers = section_numbers.pop(level)
 
             if isinstance(numbers, int):  # Only one number specified.
                 if section_numbers:  # We're not done.
-                    yield from self.all_subsections(_section=section[numbers], **section_numbers)
+                    yield from self.all_subsections(_section=section._numbered_child(level, numbers),
+                                                    **section_numbers)
                 else:  # We're done.
-                    yield section[numbers]
+                    yield section._numbered_child(level, numbers)
 
             else:  # Multiple numbers specified.
                 if section_numbers:  # We're not done.
                     for n in numbers:
-                        yield from self.all_subsections(_section=section[n], **section_numbers)
+                        yield from self.all_subsections(_section=section._numbered_child(level, n), **section_numbers)
                 else:  # We're done.
-                    yield from (section[n] for n in numbers)
+                    yield from (section._numbered_child(level, n) for n in numbers)
         else:
             # Section not specified but we're not done; descend into every child.
             for child in section:
@@ -423,16 +767,9 @@ class ExperimentSection:
         |ExperimentSection|
 
         """
-        key = lambda node: node.level == at_level
-
         if by_started:
-            path_key = lambda node: not node.has_started
-        else:
-            path_key = lambda node: not node.has_finished
-
-        result = self.depth_first_search(key, path_key=path_key)
-        if result:
-            return result[-1]
+            return self._find_first(at_level, 'not_started', lambda node: not node.has_started)
+        return self._find_first(at_level, 'not_finished', lambda node: not node.has_finished)
 
     def find_first_partially_run(self, at_level):
         """
@@ -450,14 +787,15 @@ class ExperimentSection:
         |ExperimentSection|
 
         """
-        key = lambda node: node.level == at_level
-        path_key = lambda node: node.has_started and not node.has_finished
+        return self._find_first(at_level, 'partially_run', lambda node: node.has_started and not node.has_finished)
 
-        result = self.depth_first_search(key, path_key=path_key)
+    def _find_first(self, at_level, status, path_key):
+        # `status` names the search for experiments that can look up sections in an index (see Experiment).
+        result = self.depth_first_search(lambda node: node.level == at_level, path_key=path_key)
         if result:
             return result[-1]
 
-    def breadth_first_search(self, key):
+    def breadth_first_search(self, key, path_key=None):
         """
         Breadth-first search starting from here.
         Returns the entire search path.
@@ -466,6 +804,9 @@ class ExperimentSection:
         ----------
         key : func
             Function that returns True or False when passed an |ExperimentSection|.
+        path_key : func, optional
+            Function that returns True or False when passed an |ExperimentSection|.
+            If given, the search will proceed only via sections for which `path_key` returns True.
 
         Returns
         -------
@@ -480,7 +821,8 @@ class ExperimentSection:
                 return path
 
             for child in node:
-                paths.append(path.copy() + [child])
+                if not path_key or path_key(child):
+                    paths.append(path.copy() + [child])
 
         return []
 
@@ -561,7 +903,22 @@ class ExperimentSection:
         if section.level == '_base':
             return []
 
-        return self.breadth_first_search(lambda node: section in node)
+        parents = []
+        parent = section._parent
+        while parent is not None and parent is not self:
+            parents.append(parent)
+            parent = parent._parent
+        if parent is self:
+            parents.append(self)
+            return parents[::-1]
+
+        # Links to parents can be missing, e.g. after loading from some formats. Search for the parents instead.
+        # Ancestors of `section` share its section numbers, so other sections don't need to be searched.
+        path_key = lambda node: node.level in section.data and section.data[node.level] == node.data[node.level]
+        parents = self.breadth_first_search(lambda node: section in node, path_key=path_key)
+        for parent in parents:
+            parent._link_children()
+        return parents
 
     def _convert_index_object(self, item):
         """
@@ -624,6 +981,7 @@ class ExperimentSection:
 
     def __setitem__(self, key, value):
         self._children[self._convert_index_object(key)] = value
+        self._link_children()
         self._number_children()
 
     def __reversed__(self):
@@ -631,3 +989,273 @@ class ExperimentSection:
 
     def __contains__(self, item):
         return item in self._children
+
+
+class DeferredChildren:
+    """
+    Stands in for the children of a section that haven't been created yet (see |ExperimentSection.new|)
+    until they are first accessed, when they are created from the section's |DesignTree|.
+
+    """
+    def __repr__(self):
+        return '{}()'.format(self.__class__.__name__)
+
+    def __eq__(self, other):
+        return isinstance(other, type(self))
+
+    def load_children(self, section):
+        section._children = collections.deque()
+        section.append_design_tree(section.get_next_tree(), lazy=True, _renumber=False)
+        # The positions of existing sections don't change, so searches needn't be restarted.
+        section._assign_numbers()
+        return section._children
+
+
+def _seeded_rng(seed, spawn_key=()):
+    # A random.Random generator, identified within an experiment seeded with `seed` by `spawn_key`,
+    # a tuple of integers (see numpy.random.SeedSequence).
+    sequence = np.random.SeedSequence(seed, spawn_key=spawn_key)
+    return random.Random(int.from_bytes(sequence.generate_state(4).tobytes(), 'little'))
+
+
+class _Subtree(ExperimentSection):
+    # A section created apart from the rest of the experiment, in a worker process (see _create_descendants),
+    # which orders its descendants as it would in place: at `spawn_key` in an experiment seeded with `seed`.
+    seed = None
+    spawn_key = ()
+
+
+def _create_subtree(tree, data, seed, spawn_key):
+    section = _Subtree.new(tree, data, lazy=True)
+    section.seed, section.spawn_key = seed, spawn_key
+    section._create_descendants()
+    # The children are sent back without the section, which is replaced by the original.
+    return section._children
+
+
+def _group_columns(siblings, ancestors):
+    # The data of a group of sibling sections by column, including that of their ancestors (see _data_groups).
+    n = len(siblings)
+    # The tables and rows of the siblings, their parents, etc.
+    tables = [siblings[0]._table] + [ancestor._table for ancestor in reversed(ancestors)]
+    rows = [[sibling._local for sibling in siblings]] + [[ancestor._local] * n for ancestor in reversed(ancestors)]
+    if any(sibling._table is not tables[0] for sibling in siblings):
+        # A section whose data hasn't been moved into its siblings' table.
+        group_columns = collections.defaultdict(lambda: [MISSING] * n)
+        for i, sibling in enumerate(siblings):
+            for key, value in sibling.data.items():
+                group_columns[key][i] = value
+        return group_columns
+
+    group_columns = {}
+    for key in set().union(*(table.columns for table in tables)):
+        values = None
+        for table, table_rows in zip(tables, rows):
+            if key not in table.columns:
+                continue
+            found = table.get_column(key, table_rows)
+            values = found if values is None else [
+                value if value is not MISSING else parent_value
+                for value, parent_value in zip(values, found)]
+            if not any(value is MISSING for value in values):
+                break
+        group_columns[key] = values
+    return group_columns
+
+
+class _Missing:
+    # Marks values missing from a row of a DataTable.
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __reduce__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class DataTable:
+    """
+    The data of a group of sibling sections, stored by column.
+    Each section is a row of the table, identified by its index.
+
+    Attributes
+    ----------
+    columns : dict
+        Maps each key to a list of the values of each row,
+        with ``MISSING`` for rows that don't have the key.
+        The lists may be shorter than the number of rows, if the last rows don't have the key.
+    n_rows : int
+
+    """
+    __slots__ = ('columns', 'n_rows')
+
+    def __init__(self, columns=None, n_rows=0):
+        self.columns = {} if columns is None else columns
+        self.n_rows = n_rows
+
+    def row(self, data):
+        """Add a row containing the items of the mapping `data`, and return its index."""
+        i = self.n_rows
+        self.n_rows += 1
+        for key, value in data.items():
+            self.set(i, key, value)
+        return i
+
+    def get(self, i, key):
+        """Get the value of `key` in row `i`, or ``MISSING``."""
+        column = self.columns.get(key)
+        if column is not None and i < len(column):
+            return column[i]
+        return MISSING
+
+    def set(self, i, key, value):
+        column = self.columns.setdefault(key, [])
+        if i >= len(column):
+            column.extend(MISSING for _ in range(i + 1 - len(column)))
+        column[i] = value
+
+    def get_column(self, key, rows):
+        """Get the values of `key` in each of `rows` (a sequence of row indices)."""
+        column = self.columns.get(key)
+        if column is None:
+            return [MISSING] * len(rows)
+        n = len(column)
+        return [column[i] if i < n else MISSING for i in rows]
+
+    def __getstate__(self):
+        return {'columns': self.columns, 'n_rows': self.n_rows}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+
+class _Row(MutableMapping):
+    # The data of one section, stored as a row of a DataTable.
+    __slots__ = ('table', 'i')
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+
+    def __getitem__(self, key):
+        value = self.table.get(self.i, key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.table.set(self.i, key, value)
+
+    def __delitem__(self, key):
+        self[key]  # Raise KeyError if missing.
+        self.table.set(self.i, key, MISSING)
+
+    def __iter__(self):
+        for key, column in self.table.columns.items():
+            if self.i < len(column) and column[self.i] is not MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class SectionData(MutableMapping):
+    """
+    The data of an |ExperimentSection|: its own data, plus the data of its parents.
+    This is a view that behaves like a |ChainMap| whose first mapping is the section's own data.
+    Reading finds keys in the section or any of its parents, while changes only affect the section itself.
+
+    Attributes
+    ----------
+    maps : list of mappings
+        The section's own data, followed by that of each of its parents.
+    parents : |ChainMap|
+        The data of the section's parents.
+
+    """
+    __slots__ = ('section',)
+
+    def __init__(self, section):
+        self.section = section
+
+    @property
+    def maps(self):
+        maps = []
+        section = self.section
+        while True:
+            maps.append(section._local if section._table is None else _Row(section._table, section._local))
+            if section._parent is None:
+                break
+            section = section._parent
+        if section._inherited is not None:
+            maps.extend(section._inherited.maps)
+        return maps
+
+    @property
+    def parents(self):
+        return collections.ChainMap(*self.maps[1:])
+
+    def new_child(self, m=None):
+        return collections.ChainMap({} if m is None else m, *self.maps)
+
+    def copy(self):
+        maps = self.maps
+        return collections.ChainMap(dict(maps[0]), *maps[1:])
+
+    def __getitem__(self, key):
+        section = self.section
+        while True:
+            table = section._table
+            if table is None:
+                if key in section._local:
+                    return section._local[key]
+            else:
+                value = table.get(section._local, key)
+                if value is not MISSING:
+                    return value
+
+            if section._parent is None:
+                if section._inherited is not None:
+                    return section._inherited[key]
+                raise KeyError(key)
+            section = section._parent
+
+    def __setitem__(self, key, value):
+        section = self.section
+        if section._table is None:
+            section._local[key] = value
+        else:
+            section._table.set(section._local, key, value)
+
+    def __delitem__(self, key):
+        section = self.section
+        if section._table is None:
+            del section._local[key]
+        else:
+            del _Row(section._table, section._local)[key]
+
+    def __iter__(self):
+        keys = {}
+        for mapping in reversed(self.maps):
+            keys.update(dict.fromkeys(mapping))
+        return iter(keys)
+
+    def __len__(self):
+        return len(set().union(*self.maps))
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(map(repr, self.maps)))
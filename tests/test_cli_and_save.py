@@ -7,15 +7,19 @@ it.
 import sys
 import os
 import filecmp
+import shutil
+import sqlite3
 from glob import glob
-from contextlib import contextmanager
+from contextlib import contextmanager, closing
 from numpy import isnan
+import pandas as pd
 import pytest
 
-from experimentator import run_experiment_section, QuitSession, Experiment
+from experimentator import run_experiment_section, QuitSession, Experiment, yaml, _export
 from experimentator.__main__ import main
 from experimentator.order import Ordering
-from tests.test_experiment import make_blocked_exp, check_trial
+from experimentator._storage import BINARY_MAGIC
+from tests.test_experiment import make_blocked_exp, make_lazy_blocked_exp, check_trial, trial
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -184,6 +188,163 @@ def test_export():
         os.remove(file)
 
 
+def test_export_csv_in_chunks():
+    make_deterministic_exp()
+    exp = Experiment.load('test.yaml')
+    exp[1][1][1].add_data({'result': 1})
+    exp[1][2][3].add_data({'result': 2})
+    exp[1].data['note'] = 'x'
+
+    kwargs = dict(float_format='%.2f', na_rep='NA', index_label=False)
+    with open('expected.csv', 'w') as f:
+        exp.dataframe.to_csv(f, **kwargs)
+    for chunk_size in [1, 5, 1000]:
+        _export.export_csv(exp, 'test.csv', chunk_size=chunk_size, **kwargs)
+        assert filecmp.cmp('expected.csv', 'test.csv', shallow=False)
+
+    with open('expected.csv', 'w') as f:
+        exp.dataframe.drop(columns=['note']).to_csv(f)
+    _export.export_csv(exp, 'test.csv', skip_columns=['note'], chunk_size=5)
+    assert filecmp.cmp('expected.csv', 'test.csv', shallow=False)
+
+    for file in glob('test.yaml*') + ['test.csv', 'expected.csv']:
+        os.remove(file)
+
+
+def test_export_selected_sections():
+    make_deterministic_exp()
+    exp = Experiment.load('test.yaml')
+    exp.run_section(exp[1][1][1])
+    exp.run_section(exp[1][1][2])
+    exp[1][1][3].has_started = True
+    exp.save()
+    read = lambda: pd.read_csv('test.csv', index_col=[0, 1, 2])
+
+    call_cli('exp export test.yaml test.csv participant 1 block 2')
+    expected = exp.dataframe
+    assert read().equals(expected[expected.index.get_level_values('block') == 2])
+
+    call_cli('exp export test.yaml test.csv block 1 block 3')
+    data = read()
+    assert sorted(set(data.index.get_level_values('block'))) == [1, 3]
+    assert len(data) == 16
+
+    call_cli('exp export test.yaml test.csv --finished')
+    assert list(read().index) == [(1, 1, 1), (1, 1, 2)]
+
+    call_cli('exp export test.yaml test.csv participant 1 block 1 --started')
+    assert list(read().index) == [(1, 1, 1), (1, 1, 2), (1, 1, 3)]
+
+    call_cli('exp export test.yaml test.csv block 2 --finished')
+    assert read().empty
+
+    # A section run from partway through finishes without its first children having run.
+    exp.run_section(exp[1][4], from_section=3)
+    assert exp[1][4].has_finished and not exp[1][4][2].has_started
+    exp.export_data('test.csv', sections={'block': 4}, status='finished')
+    assert list(read().index) == [(1, 4, t) for t in range(3, 9)]
+
+    for file in glob('test.yaml*') + ['test.csv']:
+        os.remove(file)
+
+
+def test_export_incremental():
+    make_deterministic_exp()
+    exp = Experiment.load('test.yaml')
+    read = lambda: pd.read_csv('test.csv', index_col=[0, 1, 2])
+
+    exp.export_data('test.csv', incremental=True)
+    assert os.path.getsize('test.csv') == 0
+
+    exp.run_section(exp[1][1][1])
+    exp[1][1][1].add_data({'result': 1.5})
+    exp.run_section(exp[1][1][2])
+    exp.export_data('test.csv', incremental=True)
+    assert list(read().index) == [(1, 1, 1), (1, 1, 2)]
+
+    exp.run_section(exp[1][1])
+    exp.run_section(exp[1][2][1])
+    exp.export_data('test.csv', incremental=True)
+    data = read()
+    assert list(data.index) == [(1, 1, t) for t in range(1, 9)] + [(1, 2, 1)]
+    assert data['result'].iloc[0] == 1.5 and data['result'].iloc[1:].isnull().all()
+    expected = exp.dataframe
+    assert data.equals(expected[:9])
+    with open('test.csv.exported') as f:
+        assert sorted(yaml.load(f)['exported']) == [[1, 1], [1, 2, 1]]
+
+    # Nothing new.
+    exp.export_data('test.csv', incremental=True)
+    assert len(read()) == 9
+
+    # A block run from partway through is exported trial by trial, so its first trials are exported once they run.
+    exp.run_section(exp[1][3], from_section=3)
+    exp.export_data('test.csv', incremental=True)
+    assert list(read().index)[9:] == [(1, 3, t) for t in range(3, 9)]
+    exp.run_section(exp[1][3][1])
+    exp.export_data('test.csv', incremental=True)
+    assert list(read().index)[15:] == [(1, 3, 1)]
+
+    exp.run_section(exp[1][2][2])
+    exp[1][2][2].add_data({'other': 'x'})
+    with pytest.raises(ValueError):
+        exp.export_data('test.csv', incremental=True)
+
+    # Without the sidecar file, the data is exported again from scratch.
+    os.remove('test.csv.exported')
+    exp.export_data('test.csv', incremental=True)
+    assert list(read().index) == ([(1, 1, t) for t in range(1, 9)] + [(1, 2, 1), (1, 2, 2), (1, 3, 1)]
+                                  + [(1, 3, t) for t in range(3, 9)])
+
+    with pytest.raises(ValueError):
+        exp.export_data('test.parquet', incremental=True)
+
+    for file in glob('test.yaml*') + glob('test.csv*'):
+        os.remove(file)
+
+
+def test_export_incremental_lazy():
+    exp = make_lazy_blocked_exp()
+    exp.run_section(exp[2])
+    for _ in range(2):
+        exp.export_data('test.csv', incremental=True)
+        assert not exp[1].is_loaded and not exp[3].is_loaded
+    data = pd.read_csv('test.csv', index_col=[0, 1, 2])
+    assert set(data.index.get_level_values(0)) == {2}
+    assert len(data) == len(exp[2].dataframe)
+
+    for file in glob('test.csv*'):
+        os.remove(file)
+
+
+def test_export_arrow():
+    pytest.importorskip('pyarrow')
+    import pandas as pd
+    make_deterministic_exp()
+    exp = Experiment.load('test.yaml')
+    exp[1][1][1].add_data({'result': 0.5})
+    exp.save()
+    expected = exp.dataframe.reset_index()
+
+    for filename, options, read in [('test.parquet', '', pd.read_parquet),
+                                    ('test.feather', '', pd.read_feather),
+                                    ('test.data', '--format parquet', pd.read_parquet)]:
+        call_cli('exp export test.yaml {} {}'.format(filename, options))
+        data = read(filename)
+        assert list(data.columns) == list(expected.columns)
+        assert data['a'].dtype == bool and data['b'].dtype.kind == 'i'
+        assert data['result'][0] == 0.5 and data['result'][1:].isnull().all()
+        assert data.equals(expected)
+        os.remove(filename)
+
+    call_cli('exp export test.yaml test.parquet --skip a')
+    assert 'a' not in pd.read_parquet('test.parquet').columns
+    os.remove('test.parquet')
+
+    for file in glob('test.yaml*'):
+        os.remove(file)
+
+
 def bad_trial(experiment, section):
     raise QuitSession('Nope!')
 
@@ -205,3 +366,245 @@ def test_exception():
     assert e.__str__() == 'message'
     with pytest.raises(QuitSession):
         raise e
+
+
+def test_journal():
+    exp = make_blocked_exp()
+    exp.journal = True
+    exp.filename = 'test.yaml'
+    exp.save()
+    snapshot_time = os.path.getmtime('test.yaml')
+
+    run_experiment_section('test.yaml', participant=1)
+    assert os.path.getmtime('test.yaml') == snapshot_time
+    assert os.path.exists('test.yaml.journal')
+
+    exp = Experiment.load('test.yaml')
+    assert exp[1].has_started and exp[1].has_finished
+    assert not exp[2].has_started
+    for row in exp.dataframe.iterrows():
+        if row[0][0] == 1:
+            check_trial(row)
+        else:
+            assert isnan(row[1]['result'])
+
+    exp.journal_limit = 0
+    run_experiment_section(exp, participant=2)
+    assert not os.path.exists('test.yaml.journal')
+    exp = Experiment.load('test.yaml')
+    assert exp[2].has_finished
+    for row in exp.dataframe.iterrows():
+        if row[0][0] <= 2:
+            check_trial(row)
+        else:
+            assert isnan(row[1]['result'])
+
+    for file in glob('test.yaml*'):
+        os.remove(file)
+
+
+def test_journal_outside_sections():
+    exp = make_blocked_exp()
+    exp.journal = True
+    exp.filename = 'test.yaml'
+    exp.save()
+    snapshot_time = os.path.getmtime('test.yaml')
+
+    exp = Experiment.load('test.yaml')
+    exp.subsection(participant=2).add_data({'age': 30})
+    exp.add_data({'location': 'lab'})
+    exp.experiment_data['note'] = 'pilot'
+    exp.add_callback('block', trial, 'x')
+    exp.checkpoint()
+    assert os.path.getmtime('test.yaml') == snapshot_time
+
+    exp = Experiment.load('test.yaml')
+    assert exp[2].data['age'] == 30 and exp[2][1][1].data['age'] == 30
+    assert exp[1].data['location'] == 'lab'
+    assert exp.experiment_data == {'note': 'pilot'}
+    assert exp._callback_info['block'][1] == ('x',)
+    assert 'block' in exp.callback_by_level
+
+    # Nothing new.
+    exp.checkpoint()
+    assert exp._journal_length == 3
+
+    for file in glob('test.yaml*'):
+        os.remove(file)
+
+
+def test_binary_format():
+    make_deterministic_exp()
+    call_cli('exp convert test.yaml test.pkl')
+    with open('test.pkl', 'rb') as f:
+        assert f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+    yaml_exp = Experiment.load('test.yaml')
+    binary_exp = Experiment.load('test.pkl')
+    assert binary_exp.filename == 'test.pkl'
+    assert binary_exp.dataframe.equals(yaml_exp.dataframe)
+
+    run_experiment_section(binary_exp, participant=1)
+    assert Experiment.load('test.pkl')[1].has_finished
+
+    call_cli('exp convert test.pkl test.yaml')
+    assert Experiment.load('test.yaml')[1].has_finished
+
+    for file in glob('test.yaml*') + glob('test.pkl*'):
+        os.remove(file)
+
+
+def test_directory_format():
+    make_deterministic_exp()
+    call_cli('exp convert test.yaml test_exp/')
+    assert sorted(os.listdir('test_exp')) == ['experiment.pkl', 'participant-1.pkl']
+
+    exp = make_blocked_exp()
+    exp.save('test_exp/')
+    exp = Experiment.load('test_exp')
+    assert len(exp) == 12
+    assert not any(participant.is_loaded for participant in exp)
+    assert exp.subsection(participant=3, block=2).level == 'block'
+    assert [participant.is_loaded for participant in exp] == [i == 3 for i in range(1, 13)]
+    exp.subsection(participant=3).add_data({'age': 30})
+    exp.save()
+
+    file_times = {file: os.path.getmtime(file) for file in glob('test_exp/*')}
+    run_experiment_section('test_exp', participant=2)
+    assert [file for file, time in file_times.items() if os.path.getmtime(file) != time] == [
+        os.path.join('test_exp', 'participant-2.pkl')]
+
+    exp = Experiment.load('test_exp')
+    assert exp[3][1][1].data['age'] == 30
+    for row in exp.dataframe.iterrows():
+        if row[0][0] == 2:
+            check_trial(row)
+        else:
+            assert isnan(row[1]['result'])
+
+    for file in glob('test.yaml*'):
+        os.remove(file)
+    shutil.rmtree('test_exp')
+
+
+def test_concurrent_stations():
+    make_blocked_exp().save('test_exp/')
+
+    # Two stations load the experiment before either has saved anything.
+    station_1 = Experiment.load('test_exp')
+    station_2 = Experiment.load('test_exp')
+    run_experiment_section(station_1, participant=1)
+    run_experiment_section(station_2, participant=2, block=1)
+
+    exp = Experiment.load('test_exp')
+    assert exp[1].has_finished and exp[2].has_started
+    assert exp[2][1].has_finished and not exp[2][2].has_started
+    assert exp.find_first_not_run('participant') is exp[3]
+
+    call_cli('exp merge test_exp test_merged.pkl')
+    merged = Experiment.load('test_merged.pkl')
+    assert all(participant.is_loaded for participant in merged)
+    assert merged.dataframe.equals(exp.dataframe)
+
+    with pytest.raises(ValueError):
+        call_cli('exp merge test_merged.pkl test_merged.yaml')
+
+    os.remove('test_merged.pkl')
+    shutil.rmtree('test_exp')
+
+
+def test_directory_format_first_save():
+    # Running a section of an experiment that has never been saved saves the entire experiment.
+    exp = make_blocked_exp()
+    exp.filename = 'test_exp/'
+    run_experiment_section(exp, participant=2, block=1)
+
+    exp = Experiment.load('test_exp')
+    assert len(exp) == 12
+    assert exp[2][1].has_finished and not exp[1].has_started
+    assert exp.find_first_not_run('block') is exp[1][1]
+
+    shutil.rmtree('test_exp')
+
+
+def test_sqlite_format():
+    exp = make_blocked_exp()
+    exp.save('test.db')
+    exp = Experiment.load('test.db')
+    assert not any(participant.is_loaded for participant in exp)
+
+    block = exp.find_first_not_run('block')
+    assert (block.data['participant'], block.data['block']) == (1, 1)
+    assert [participant.is_loaded for participant in exp] == [i == 1 for i in range(1, 13)]
+
+    run_experiment_section('test.db', participant=1)
+    run_experiment_section('test.db', participant=3, block=1)
+    run_experiment_section('test.db', participant=3, block=2, trial=1)
+
+    exp = Experiment.load('test.db')
+    assert exp.find_first_not_run('participant') is exp[2]
+    assert exp.find_first_not_run('block', by_started=False) is exp[2][1]
+    assert exp.find_first_partially_run('block') is exp[3][2]
+    assert exp.find_first_partially_run('trial') is None
+    assert [participant.is_loaded for participant in exp] == [i in (2, 3) for i in range(1, 13)]
+
+    # Searches of loaded sections use their current status, rather than the saved index.
+    exp[2].has_started = exp[2][1].has_started = True
+    exp[3][2].has_finished = True
+    assert exp.find_first_not_run('block') is exp[4][1]
+    assert exp.find_first_partially_run('block') is exp[2][1]
+
+    exp = Experiment.load('test.db')
+    for row in exp.dataframe.iterrows():
+        if row[0][0] == 1 or row[0][0] == 3 and (row[0][1] == 1 or row[0][1:] == (2, 1)):
+            check_trial(row)
+        else:
+            assert isnan(row[1]['result'])
+
+    exp.save('test.pkl')
+    assert Experiment.load('test.pkl').dataframe.equals(exp.dataframe)
+
+    for file in glob('test.db*') + glob('test.pkl*'):
+        os.remove(file)
+
+
+def test_sqlite_format_first_save():
+    # Running a section of an experiment that has never been saved saves the entire experiment.
+    exp = make_blocked_exp()
+    exp.filename = 'test.db'
+    run_experiment_section(exp, participant=2, block=1)
+
+    exp = Experiment.load('test.db')
+    assert len(exp) == 12
+    assert exp[2][1].has_finished and not exp[1].has_started
+    assert exp.find_first_not_run('block') is exp[1][1]
+    os.remove('test.db')
+
+    with closing(sqlite3.connect('test.db')):
+        pass
+    with pytest.raises(ValueError):
+        Experiment.load('test.db')
+    os.remove('test.db')
+
+
+def test_lazy_experiment_formats():
+    for filename in ('test.yaml', 'test.pkl', 'test_exp/', 'test.db'):
+        exp = make_lazy_blocked_exp()
+        exp.journal = filename == 'test.yaml'
+        exp.filename = filename
+        exp.save()
+
+        run_experiment_section(filename, participant=2)
+        exp = Experiment.load(filename)
+        assert not exp[1].is_loaded and not exp[3].is_loaded
+        assert exp[2].has_finished
+        assert exp.find_first_not_run('block') is exp[1][1]
+        for row in exp.dataframe.iterrows():
+            if row[0][0] == 2:
+                check_trial(row)
+            else:
+                assert isnan(row[1]['result'])
+
+        for file in glob('test.yaml*') + glob('test.pkl*') + glob('test.db*'):
+            os.remove(file)
+        shutil.rmtree('test_exp', ignore_errors=True)
@@ -64,6 +64,36 @@ def test_factorial():
         yield check_sequences, d.get_order(), conditions
 
 
+def test_full_cross_sequence():
+    iv_names = ('a', 'b', 'c')
+    iv_values = [[1, 2], range(3), 'xy']
+    cross = Design.full_cross(iv_names, iv_values)
+    conditions = [dict(zip(iv_names, values)) for values in product(*iv_values)]
+    assert len(cross) == 12
+    assert cross == conditions
+    assert [cross[i] for i in range(len(cross))] == conditions
+    assert cross[-1] == conditions[-1]
+    assert cross[3:6] == conditions[3:6]
+    with pytest.raises(IndexError):
+        cross[12]
+
+    assert len(3 * cross) == 36
+    assert 3 * cross == 3 * conditions
+    assert (3 * cross)[25] == conditions[1]
+
+
+def test_huge_full_cross():
+    iv_names = list('abcdef')
+    iv_values = 6 * [range(10)]
+    d = Design(zip(iv_names, iv_values), ordering=Shuffle(2))
+    d.first_pass()
+    order = d.get_order()
+    assert len(order) == 2000000
+    assert order[0] != order[1]
+    assert set(order[0]) == set(iv_names)
+    assert d.get_order()[:10] != order[:10]
+
+
 def order_to_array(order, iv_names):
     return [[condition[iv] for iv in iv_names] for condition in order]
 
@@ -131,6 +161,23 @@ def test_design_matrix_with_continuous_iv():
         yield check_design_matrix, d.get_order(), iv_names, iv_values, matrix
 
 
+def test_design_matrix_with_mixed_ivs():
+    matrix = np.array([[3, 0.5, 20],
+                       [1, 0.25, 10],
+                       [2, 0.5, 10],
+                       [3, 0.75, 20]])
+    d = Design([('a', ['low', 'mid', 'high']), ('b', None), ('c', [False, True])], design_matrix=matrix,
+               extra_data={'d': 1})
+    d.first_pass()
+    assert d.get_order() == [{'a': 'high', 'b': 0.5, 'c': True, 'd': 1},
+                             {'a': 'low', 'b': 0.25, 'c': False, 'd': 1},
+                             {'a': 'mid', 'b': 0.5, 'c': False, 'd': 1},
+                             {'a': 'high', 'b': 0.75, 'c': True, 'd': 1}]
+
+    with pytest.raises(ValueError):
+        Design([('a', ['low', 'high']), ('b', None), ('c', [False, True])], design_matrix=matrix).first_pass()
+
+
 def check_design(design, iv_names, iv_values, n, data, matrix):
     assert set(design.iv_names) == set(iv_names)
     assert len(design.get_order(data)) == n
@@ -1,10 +1,11 @@
 """Tests for Experiment object.
 
 """
+import pickle
 from contextlib import contextmanager
 import pytest
 
-from experimentator.order import Shuffle, CompleteCounterbalance
+from experimentator.order import Shuffle, CompleteCounterbalance, LatinSquare
 from experimentator import Design, DesignTree, Experiment
 
 from tests.test_design import check_equality
@@ -93,6 +94,75 @@ def test_data_before_running():
     assert sum(data['b']) == 2*6*2*4*1 + 2*6*2*4*2
 
 
+def make_lazy_blocked_exp():
+    exp = Experiment.blocked({'a': [False, True]}, 2,
+                             block_ivs={'b': [0, 1, 2]},
+                             orderings={'trial': Shuffle(4), 'block': CompleteCounterbalance()},
+                             lazy=True)
+    exp.add_callback('trial', trial)
+    return exp
+
+
+def test_lazy_construction():
+    exp = make_lazy_blocked_exp()
+    assert not exp.is_loaded
+    assert len(exp) == 12
+    assert not any(participant.is_loaded for participant in exp)
+    assert [participant.data['participant'] for participant in exp] == list(range(1, 13))
+    assert sorted(participant.data[CompleteCounterbalance.iv_name] for participant in exp) == sorted(2 * list(range(6)))
+
+    # The sections are the same however many times they are created.
+    copy = pickle.loads(pickle.dumps(exp))
+    assert list(copy) == list(exp)
+    assert copy[3][2][5].data == exp[3][2][5].data
+    assert [participant.is_loaded for participant in exp] == [i == 3 for i in range(1, 13)]
+    assert copy.dataframe.equals(exp.dataframe)
+
+    data = exp.dataframe
+    eager_data = make_blocked_exp().dataframe
+    assert data.shape == eager_data.shape
+    assert data.index.names == eager_data.index.names
+    assert data.sort_index().index.equals(eager_data.sort_index().index)
+    assert sum(data['b']) == sum(eager_data['b'])
+
+
+def test_seed():
+    make_exp = lambda **kwargs: Experiment.blocked({'a': [False, True]}, 2, block_ivs={'b': [0, 1, 2]},
+                                                   orderings={'trial': Shuffle(4), 'block': Shuffle(2)}, **kwargs)
+    exp = make_exp(seed=1)
+    assert exp.seed == 1
+    assert exp == make_exp(seed=1)
+    assert exp != make_exp(seed=2)
+    assert make_exp().seed != make_exp().seed
+
+    # Each section is ordered according to its position, so it's the same however the experiment is created.
+    lazy_exp = make_exp(seed=1, lazy=True)
+    assert list(lazy_exp.subsection(participant=2, block=3)) == list(exp.subsection(participant=2, block=3))
+    assert lazy_exp[2].is_loaded and not lazy_exp[1].is_loaded
+    assert lazy_exp.dataframe.equals(exp.dataframe)
+
+    make_exp = lambda **kwargs: Experiment.within_subjects({'a': list(range(4))}, 8, ordering=LatinSquare(**kwargs),
+                                                           seed=1)
+    for kwargs in [{}, {'balanced': False}, {'balanced': False, 'uniform': 'markov'}]:
+        assert make_exp(**kwargs) == make_exp(**kwargs)
+
+    spec = lambda: {'design': [{'name': 'trial', 'ivs': {'a': list(range(10))}}], 'seed': 5}
+    exp = Experiment.from_dict(spec())
+    assert exp.seed == 5 and 'seed' not in exp.experiment_data
+    assert exp == Experiment.from_dict(spec())
+
+
+def test_parallel_construction():
+    make_exp = lambda **kwargs: Experiment.blocked({'a': [False, True]}, 2, block_ivs={'b': [0, 1, 2]},
+                                                   orderings={'trial': Shuffle(4), 'block': CompleteCounterbalance()},
+                                                   seed=1, **kwargs)
+    exp = make_exp(processes=2)
+    assert all(section.is_loaded for section in exp.walk())
+    assert all(participant._parent is exp and participant[1]._parent is participant for participant in exp)
+    assert exp == make_exp()
+    assert exp.dataframe.equals(make_exp().dataframe)
+
+
 def test_demo_mode():
     exp = make_simple_exp()
     exp.run_section(exp[1], demo=True)
@@ -182,6 +252,36 @@ def test_find_first_not_run():
     assert exp[2].find_first_not_run('trial') is exp[2][1]
 
 
+def test_find_first_not_run_resumes():
+    exp = make_blocked_exp()
+
+    def check():
+        for level in ('participant', 'block', 'trial'):
+            for by_started in (True, False):
+                path_key = (lambda node: not node.has_started) if by_started else (lambda node: not node.has_finished)
+                path = exp.depth_first_search(lambda node: node.level == level, path_key=path_key)
+                assert exp.find_first_not_run(level, by_started) is path[-1]
+
+    check()
+    exp.run_section(exp.subsection(participant=1, block=1, trial=1))
+    check()
+    exp.run_section(exp.subsection(participant=1, block=2))
+    check()
+    exp.run_section(exp.subsection(participant=1, block=1), from_section=2)
+    check()
+    assert exp.find_first_not_run('block', by_started=False) is exp[1][3]
+
+    # Changing the experiment resets the search.
+    exp[1].append_child({'b': 0})
+    check()
+    assert exp.find_first_not_run('block', by_started=False) is exp[1][3]
+    del exp[1][3]
+    assert exp.find_first_not_run('block', by_started=False) is exp[1][3]
+    del exp[1]
+    check()
+    assert exp.find_first_not_run('participant') is exp[1]
+
+
 def test_run_from():
     exp = make_blocked_exp()
     exp.run_section(exp.subsection(participant=1), from_section=[2, 4])
@@ -420,6 +520,15 @@ def test_doc_yaml():
     assert len(second_experimental_section[1]) == len(second_experimental_section[2]) == 30
 
 
+def test_subsection_past_branches():
+    experiment = Experiment.from_yaml_file('tests/test.yml')
+    assert experiment.subsection(participant=2, session=3, block=2, trial=5) is experiment[2][3][2][5]
+    assert experiment.subsection(participant=2, session=1, trial=3) is experiment[2][1][1][3]
+    trials = list(experiment.all_subsections(session=3, block=2, trial=5))
+    assert len(trials) == len(experiment)
+    assert all(trial is participant[3][2][5] for trial, participant in zip(trials, experiment))
+
+
 def test_demo_parent_has_started():
     experiment = Experiment.from_yaml_file('tests/test.yml')
     experiment.run_section(experiment[1][2], demo=True)
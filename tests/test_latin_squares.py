@@ -1,12 +1,13 @@
 """Tests for Latin squares in experimentator/common.py.
 
 """
+import random
 from collections import Counter
 from itertools import product
 import numpy as np
 import pytest
 
-from experimentator.order import latin_square, balanced_latin_square
+from experimentator.order import latin_square, balanced_latin_square, LatinSquare
 
 REPEATS = 2
 MAX_ORDER_FOR_UNIFORM = 4
@@ -14,6 +15,7 @@ MAX_ORDER_FOR_UNIFORM_REDUCED = 5
 MAX_ORDER_FOR_NON_UNIFORM = 6
 MAX_ORDER_FOR_NON_UNIFORM_REDUCED = 8
 MAX_ORDER_FOR_BALANCED = 10
+MARKOV_ORDERS = [2, 3, 4, 5, 10, 30]
 
 
 def check_latin_square(matrix):
@@ -28,7 +30,7 @@ def check_reduced(matrix):
 
 
 def check_balanced(matrix):
-    order = len(matrix)
+    order = len(matrix[0])
     counts = {first: Counter() for first in range(order)}
     for row in matrix:
         for first, second in zip(row[:-1], row[1:]):
@@ -67,6 +69,30 @@ def test_latin_squares():
             yield check_latin_square, latin_square(order, reduced=True, uniform=False, shuffle=True)
 
 
+def test_large_non_uniform_latin_squares():
+    for order in [50, 100]:
+        yield check_latin_square, latin_square(order, uniform=False)
+        square = latin_square(order, reduced=True, uniform=False)
+        yield check_latin_square, square
+        yield check_reduced, square
+
+
+def test_markov_latin_squares():
+    for order in MARKOV_ORDERS:
+        for _ in range(REPEATS):
+            yield check_latin_square, latin_square(order, uniform='markov')
+            square = latin_square(order, reduced=True, uniform='markov', mixing_steps=order**2)
+            yield check_latin_square, square
+            yield check_reduced, square
+
+
+def test_markov_latin_squares_are_uniform():
+    # There are 12 Latin squares of order 3. Check that they're sampled about equally often.
+    counts = Counter(tuple(map(tuple, latin_square(3, uniform='markov'))) for _ in range(1200))
+    assert len(counts) == 12
+    assert all(50 < count < 150 for count in counts.values())
+
+
 def test_balanced_latin_squares():
     for order in range(2, MAX_ORDER_FOR_BALANCED + 1, 2):
         for _ in range(REPEATS):
@@ -75,7 +101,40 @@ def test_balanced_latin_squares():
             yield check_balanced, square
 
 
+def check_williams_design(rows):
+    order = len(rows[0])
+    assert len(rows) == 2 * order
+    assert all(sorted(row) == list(range(order)) for row in rows)
+    assert all(Counter(column) == Counter(2 * list(range(order))) for column in zip(*rows))
+
+
+def test_williams_designs():
+    for order in range(2, MAX_ORDER_FOR_BALANCED + 1):
+        for _ in range(REPEATS):
+            rows = balanced_latin_square(order, williams=True)
+            if order % 2:
+                yield check_williams_design, rows
+            else:
+                yield check_latin_square, rows
+            yield check_balanced, rows
+
+
 def test_odd_balanced_latin_squares():
     for order in range(3, MAX_ORDER_FOR_BALANCED, 2):
         with pytest.raises(ValueError):
             balanced_latin_square(order)
+
+
+def test_order_one():
+    for kwargs in [{}, {'uniform': False}, {'uniform': 'markov'}, {'uniform': 'markov', 'reduced': True}]:
+        assert latin_square(1, **kwargs) == [[0]]
+    o = LatinSquare(balanced=False, uniform='markov')
+    o.first_pass([{'a': 1}])
+    assert o.get_order({o.iv_name: 0}) == [{'a': 1}]
+
+
+def test_seeded_latin_squares():
+    for kwargs in [{}, {'reduced': True}, {'uniform': False, 'shuffle': True}, {'uniform': 'markov'}]:
+        assert latin_square(4, rng=random.Random(1), **kwargs) == latin_square(4, rng=random.Random(1), **kwargs)
+    assert (balanced_latin_square(5, williams=True, rng=random.Random(1))
+            == balanced_latin_square(5, williams=True, rng=random.Random(1)))
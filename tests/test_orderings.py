@@ -1,11 +1,13 @@
 """Tests for experimentator.order.
 
 """
+import random
 from math import factorial
 from itertools import product
 import pytest
 
-from experimentator.order import Shuffle, LatinSquare, Ordering, CompleteCounterbalance, Sorted, OrderSchema
+from experimentator.order import (Shuffle, LatinSquare, Ordering, CompleteCounterbalance, Sorted, OrderSchema,
+                                  ConditionOrder)
 
 CONDITIONS_3 = [{'a': c} for c in range(3)]
 
@@ -87,6 +89,72 @@ def test_shuffle():
             yield check_repeats, o.get_order()
 
 
+def check_max_run(conditions, max_run):
+    runs = [1]
+    for first, second in zip(conditions[:-1], conditions[1:]):
+        runs.append(runs[-1] + 1 if first == second else 1)
+    assert max(runs) <= max_run
+
+
+def test_shuffle_max_run():
+    for n in (2, 3, 10):
+        for max_run in (1, 2, 3):
+            o = Shuffle(n, max_run=max_run)
+            o.first_pass(CONDITIONS_2_2)
+            yield check_shuffle, o, len(CONDITIONS_2_2)
+            for _ in range(5):
+                yield check_max_run, o.get_order(), max_run
+
+    # Tight: the repeated condition must be spread out as far as possible.
+    o = Shuffle(max_run=2)
+    o.first_pass([{'a': 1}] * 8 + [{'a': 2}] * 3)
+    for _ in range(5):
+        order = o.get_order()
+        yield check_max_run, order, 2
+        assert len(order) == 11
+
+
+def test_shuffle_many_repeats():
+    o = Shuffle(1000, avoid_repeats=True)
+    o.first_pass(CONDITIONS_2_3)
+    order = o.get_order()
+    assert len(order) == 6000
+    check_repeats(order)
+    assert all(order.count(condition) == 1000 for condition in CONDITIONS_2_3)
+
+
+def test_shuffle_impossible():
+    with pytest.raises(ValueError):
+        Shuffle(2, avoid_repeats=True).first_pass([{'a': 1}])
+    with pytest.raises(ValueError):
+        Shuffle(max_run=2).first_pass([{'a': 1}] * 5 + [{'a': 2}])
+    with pytest.raises(ValueError):
+        Shuffle(avoid_repeats=True).first_pass(CONDITIONS_WITH_REPEAT[3:])
+
+
+def test_seeded_shuffle():
+    for o in [Shuffle(3), Shuffle(3, avoid_repeats=True), Shuffle(1000)]:
+        o.first_pass(CONDITIONS_6)
+        assert o.get_order(rng=random.Random(1)) == o.get_order(rng=random.Random(1))
+        assert o.get_order(rng=random.Random(1)) != o.get_order(rng=random.Random(2))
+
+
+def test_condition_order():
+    order = ConditionOrder(CONDITIONS_3, [2, 0, 2])
+    assert order == [{'a': 2}, {'a': 0}, {'a': 2}]
+    assert order[1:] == [{'a': 0}, {'a': 2}]
+    assert list(reversed(order)) == [{'a': 2}, {'a': 0}, {'a': 2}]
+
+    # Conditions are copies.
+    order[0]['a'] = 10
+    assert order[0] == {'a': 2}
+    assert CONDITIONS_3[2] == {'a': 2}
+
+    order = ConditionOrder(order, extra_data={'b': 1})
+    assert order == [{'a': 2, 'b': 1}, {'a': 0, 'b': 1}, {'a': 2, 'b': 1}]
+    assert order.conditions is CONDITIONS_3
+
+
 def test_shuffle_generator_condition():
     n = 3
     o = Shuffle(number=n)
@@ -135,6 +203,53 @@ def test_counterbalance_generator_condition():
     yield check_counterbalance_number, o, len(CONDITIONS_3), iv_values, 1
 
 
+def test_counterbalance_orders():
+    for conditions, n in [(CONDITIONS_3, 2), (CONDITIONS_2_2, 1), (CONDITIONS_WITH_REPEAT, 1)]:
+        o = CompleteCounterbalance(n)
+        _, iv_values = o.first_pass(conditions)
+        orders = [o.get_order({o.iv_name: i}) for i in iv_values]
+        expected = list(Ordering.possible_orders(n * conditions))
+        assert len(orders) == len(expected)
+        assert all(order in expected for order in orders)
+        assert orders == sorted(orders, key=lambda order: [o.all_conditions.index(c) for c in order])
+
+
+def test_large_counterbalance():
+    conditions = [{'a': c} for c in range(12)]
+    o = CompleteCounterbalance()
+    _, iv_values = o.first_pass(conditions)
+    assert len(iv_values) == factorial(12)
+    assert o.get_order({o.iv_name: 0}) == conditions
+    assert o.get_order({o.iv_name: iv_values[-1]}) == conditions[::-1]
+    assert sorted(o.get_order({o.iv_name: 123456789}), key=lambda c: c['a']) == conditions
+    with pytest.raises(IndexError):
+        o.get_order({o.iv_name: len(iv_values)})
+
+
+def test_counterbalance_equal_conditions():
+    # Equal conditions are counted together, whatever the order of their items or the hashability of their values.
+    conditions = [{'a': 1, 'b': 2}, {'b': 2, 'a': 1}, {'a': 2, 'b': 2}]
+    o = CompleteCounterbalance()
+    _, iv_values = o.first_pass(conditions)
+    assert len(iv_values) == 3
+
+    conditions = [{'a': [1]}, {'a': [2]}, {'a': [1]}, {'a': [2]}]
+    _, iv_values = o.first_pass(conditions)
+    assert len(iv_values) == 6
+    assert o.get_order({o.iv_name: 0}) == [{'a': [1]}, {'a': [1]}, {'a': [2]}, {'a': [2]}]
+
+
+def test_non_atomic_orders_stored_as_positions():
+    o = LatinSquare(2)
+    o.first_pass(CONDITIONS_2_2)
+    for order in o.order_ivs.values():
+        assert sorted(order) == [0, 0, 1, 1, 2, 2, 3, 3]
+
+    # Orders created by older versions store the conditions themselves.
+    o.order_ivs = {0: CONDITIONS_2_2[::-1]}
+    assert o.get_order({o.iv_name: 0}) == CONDITIONS_2_2[::-1]
+
+
 def check_sorted(o, n_conditions):
     assert len(o.get_order({o.iv_name: 'ascending'})) == n_conditions * o.number
     if o.order == 'both':
@@ -176,7 +291,7 @@ def check_latin_square_row(row):
 
 def test_latin_square():
     for conditions in (CONDITIONS_2_2, CONDITIONS_3):
-        for uniform in (True, False):
+        for uniform in (True, False, 'markov'):
             for balanced in (True, False):
                 if balanced and uniform:
                     with pytest.raises(ValueError):
@@ -193,6 +308,15 @@ def test_latin_square():
                             yield check_latin_square_row, o.get_order({iv_name: iv_value})
 
 
+def test_williams_latin_square():
+    for conditions in (CONDITIONS_2_2, CONDITIONS_3):
+        o = LatinSquare(balanced='williams')
+        iv_name, iv_values = o.first_pass(conditions)
+        assert len(iv_values) == len(conditions) * (2 if len(conditions) % 2 else 1)
+        for iv_value in iv_values:
+            yield check_latin_square_row, o.get_order({iv_name: iv_value})
+
+
 def test_latin_square_generator_condition():
     uniform = False
     balanced = False
@@ -218,7 +342,8 @@ def check_repr(obj):
 
 
 def test_reprs():
-    for ord in (CompleteCounterbalance(), Shuffle(), LatinSquare(), Ordering(), Sorted()):
+    for ord in (CompleteCounterbalance(), Shuffle(), Shuffle(2, max_run=3), LatinSquare(),
+                LatinSquare(balanced=False, uniform='markov'), Ordering(), Sorted()):
         yield check_repr, ord
 
 
@@ -122,6 +122,39 @@ def test_find_all_sections():
         assert subsection.data['trial'] in (4, 6)
 
 
+def test_subsection_after_changes():
+    section = ExperimentSection.new(make_tree(['session', 'block', 'trial'], {}))
+    third_block = section.subsection(block=3)
+    assert section.subsection(block=3, trial=2) is third_block[2]
+
+    del section[1]
+    assert section.subsection(block=2) is third_block
+    assert section.subsection(block=2, trial=2) is third_block[2]
+    with pytest.raises(ValueError):
+        section.subsection(block=6)
+    with pytest.raises(IndexError):
+        list(section.all_subsections(block=[5, 6]))
+
+    section.append_child({'a': 0, 'b': True})
+    assert section.subsection(block=6) is section[6]
+    assert list(section.all_subsections(block=[5, 6], trial=1)) == [section[5][1], section[6][1]]
+
+    new_block = section[6]
+    del section[6]
+    section[1] = new_block
+    assert section.subsection(block=1) is new_block
+
+
+def test_levels_without_ivs():
+    tree = DesignTree.new([('session', [Design(ordering=Ordering(2))]),
+                           ('block', [Design(ordering=Ordering(2))]),
+                           ('trial', [Design(ordering=Ordering(3))])])
+    section = ExperimentSection.new(tree)
+    assert section.subsection(block=2, trial=3).data['block'] == 2
+    section[2].add_data({'x': 1})
+    assert section[2][3].data['x'] == 1
+
+
 def test_heterogeneous_tree_section():
     participant = ExperimentSection.new(make_heterogeneous_tree())
     assert participant.level == 'participant'
@@ -145,6 +178,27 @@ def test_heterogeneous_tree_section():
     assert all(trial.data['difficulty'] in (1, 3, 5, 7) for trial in test_block)
 
 
+def test_dataframe_from_table():
+    def rebuild(section):
+        return pd.DataFrame(dict(trial.data) for trial in section.walk()
+                            if trial.is_bottom_level).set_index(section.levels)
+
+    section = ExperimentSection.new(make_heterogeneous_tree())
+    section[2][1].add_data({'d': 'x'})
+    section[2][1][3].add_data({'design': 'changed', 'e': 0.5})
+    moved = section[3][2]
+    del section[3][2]
+    section[2].append_child({}, tree=moved.tree)
+    section[2][3] = moved
+
+    for subsection in (section, section[2], section[2][1]):
+        data = subsection.dataframe
+        expected = rebuild(subsection)
+        assert data.shape == expected.shape
+        assert data.sort_index(axis=1).equals(expected.sort_index(axis=1))
+    assert section.dataframe.loc[(2, 1, 3), 'design'] == 'changed'
+
+
 def test_breadth_first_search():
     section = ExperimentSection.new(make_tree(['session', 'block', 'trial'], {}))
     section[1][2].data['foo'] = True
@@ -10,6 +10,7 @@ from tests.test_design import make_heterogeneous_tree
     1+1j,
     np.array([1, 1+1j, 1j]),
     np.arange(200, 220),
+    range(3, 20, 2),
     make_heterogeneous_tree(),
 ])
 def test_round_trip(data):